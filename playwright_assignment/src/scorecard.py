@@ -5,6 +5,11 @@ import sys
 
 QUERY = "sa vs ind final scorecard"
 
+# Comma-separated CSS unions: one wait matches whichever candidate renders first
+CONSENT_SEL = ", ".join(["#bnp_btn_accept", "button:has-text('I agree')", "button:has-text('Accept')"])
+SEARCH_BOX_SEL = "input[name='q'], #sb_form_q"
+RESULT_LINK_SEL = "li.b_algo h2 a"
+
 def main(headless: bool = False):
     with sync_playwright() as p:
         # Choose browser: chromium, firefox or webkit
@@ -25,29 +30,24 @@ def main(headless: bool = False):
 
             # Try to accept consent if shown
             try:
-                for sel in ["#bnp_btn_accept", "button:has-text('I agree')", "button:has-text('Accept')"]:
-                    loc = page.locator(sel)
-                    if loc.count() > 0:
-                        loc.first.click()
-                        page.wait_for_timeout(500)
-                        break
+                loc = page.locator(CONSENT_SEL)
+                if loc.count() > 0:
+                    loc.first.click()
+                    page.wait_for_timeout(500)
             except Exception:
                 pass
 
             # 2) Wait for Bing search box, type the query and press Enter
-            try:
-                search_box = page.wait_for_selector("input[name='q']", timeout=6000)
-            except PlaywrightTimeoutError:
-                # fallback to common Bing id
-                search_box = page.wait_for_selector("#sb_form_q", timeout=6000)
+            # (name='q' or the common Bing id, whichever appears first)
+            search_box = page.wait_for_selector(SEARCH_BOX_SEL, timeout=6000)
             search_box.fill(QUERY)
             search_box.press("Enter")
 
             # 3) Wait for results to load (Bing result links are typically li.b_algo h2 a)
-            page.wait_for_selector("li.b_algo h2 a", timeout=10000)
+            page.wait_for_selector(RESULT_LINK_SEL, timeout=10000)
 
             # 4) Find best candidate among result links on Bing
-            results = page.locator("li.b_algo h2 a")
+            results = page.locator(RESULT_LINK_SEL)
             count = results.count()
             chosen_index = None
             chosen_href = None
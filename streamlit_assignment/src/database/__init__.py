@@ -2,12 +2,15 @@
 Database package for patient management
 """
 
-from .connection import get_connection, init_db, init_users_table
+from .connection import get_connection, read_connection, init_db, init_users_table
 from .operations import (
     insert_patient,
+    insert_patients_bulk,
     update_patient,
     delete_patient,
     fetch_all_patients,
+    count_patients,
+    fetch_patients_fingerprint,
     fetch_patient_by_id,
     authenticate_user,
     create_user,
@@ -20,21 +23,28 @@ from .lab_tests_operations import (
     get_all_lab_tests,
     get_lab_tests_by_category,
     order_lab_test,
+    order_lab_tests_bulk,
     update_lab_test_result,
     fetch_patient_lab_tests,
     fetch_all_lab_tests_orders,
+    count_lab_test_orders,
+    fetch_pending_lab_tests,
     delete_lab_test_order,
     fetch_lab_test_by_id
 )
 
 __all__ = [
     'get_connection',
+    'read_connection',
     'init_db',
     'init_users_table',
     'insert_patient',
+    'insert_patients_bulk',
     'update_patient',
     'delete_patient',
     'fetch_all_patients',
+    'count_patients',
+    'fetch_patients_fingerprint',
     'fetch_patient_by_id',
     'authenticate_user',
     'create_user',
@@ -45,9 +55,12 @@ __all__ = [
     'get_all_lab_tests',
     'get_lab_tests_by_category',
     'order_lab_test',
+    'order_lab_tests_bulk',
     'update_lab_test_result',
     'fetch_patient_lab_tests',
     'fetch_all_lab_tests_orders',
+    'count_lab_test_orders',
+    'fetch_pending_lab_tests',
     'delete_lab_test_order',
     'fetch_lab_test_by_id'
 ]
@@ -2,25 +2,187 @@
 Database connection and initialization
 """
 
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import quote
+from .passwords import hash_password
 
 DB_PATH = "patients.db"
 TABLE_NAME = "patients"
 
+# Per-connection tuning: WAL lets readers and the writer run concurrently across
+# Streamlit sessions, and synchronous=NORMAL drops the fsync on every commit.
+# busy_timeout matches sqlite3.connect's default 5s timeout but is stated
+# explicitly; foreign_keys enforces the ON DELETE CASCADE on lab test orders.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Read-only connections skip the PRAGMAs that change or persist database state
+# (journal mode, sync, FK enforcement) and refuse writes outright.
+READ_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA query_only=ON",
+)
+
+# Read-only connections kept open per database file for the cached loaders
+READ_POOL_SIZE = 4
+
+# sqlite3 keeps an LRU of prepared statements per connection, keyed by SQL text.
+# All queries bind values with "?", so their text is stable and the default
+# of 128 entries would be enough. This leaves headroom as queries are added.
+STATEMENT_CACHE_SIZE = 256
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Open a new SQLite connection with row factory and PRAGMAs applied."""
+    # "file:" paths are SQLite URIs, e.g. a shared in-memory database for tests
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        uri=db_path.startswith("file:")
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _open_read_connection(db_path: str) -> sqlite3.Connection:
+    """Open a read-only SQLite connection with row factory and read PRAGMAs applied."""
+    uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    for pragma in READ_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _is_open(conn: sqlite3.Connection) -> bool:
+    """Return True if the connection has not been closed by its caller."""
+    try:
+        conn.execute("SELECT 1")
+        return True
+    except sqlite3.ProgrammingError:
+        return False
+
+
+class SQLiteConnectionPool:
+    """
+    Hand out one SQLite connection per (thread, database path).
+    
+    Streamlit reruns the script on every interaction; reusing the thread's
+    connection avoids reopening the file and re-applying PRAGMAs each time.
+    A connection closed by its caller is transparently replaced, a transaction
+    left open by a failed write is rolled back on checkout so it can't hold
+    the write lock, and connections of threads that have exited are closed.
+    """
+    
+    def __init__(self):
+        self._connections = {}
+        self._lock = threading.Lock()
+    
+    def _evict_dead_threads(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for key in [key for key in self._connections if key[0] not in alive]:
+            self._connections.pop(key).close()
+    
+    def get(self, db_path: str) -> sqlite3.Connection:
+        key = (threading.get_ident(), db_path)
+        with self._lock:
+            self._evict_dead_threads()
+            conn = self._connections.get(key)
+            if conn is None or not _is_open(conn):
+                conn = _open_connection(db_path)
+                self._connections[key] = conn
+            elif conn.in_transaction:
+                conn.rollback()
+            return conn
+
+
+class ReadOnlyConnectionPool:
+    """
+    A fixed number of read-only SQLite connections per database path.
+    
+    Readers are checked out for the duration of a query and returned, so
+    the open connections are shared by every session and script thread
+    instead of piling up per thread. Connections are opened lazily.
+    """
+    
+    def __init__(self, size: int = READ_POOL_SIZE):
+        self._size = size
+        self._idle = {}
+        self._lock = threading.Lock()
+    
+    def _slots(self, db_path: str) -> queue.LifoQueue:
+        with self._lock:
+            slots = self._idle.get(db_path)
+            if slots is None:
+                # None marks a slot whose connection hasn't been opened yet
+                slots = queue.LifoQueue(maxsize=self._size)
+                for _ in range(self._size):
+                    slots.put(None)
+                self._idle[db_path] = slots
+            return slots
+    
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[sqlite3.Connection]:
+        slots = self._slots(db_path)
+        conn = slots.get()
+        try:
+            if conn is None or not _is_open(conn):
+                conn = None
+                conn = _open_read_connection(db_path)
+            yield conn
+        finally:
+            slots.put(conn)
+
+
+_pool = SQLiteConnectionPool()
+_read_pool = ReadOnlyConnectionPool()
+
 
 def get_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
     """
-    Create and return a SQLite database connection.
+    Return the calling thread's pooled SQLite connection for db_path.
+    
+    Args:
+        db_path: Path to the SQLite database file, or a "file:" URI
+        
+    Returns:
+        SQLite connection with row factory and PRAGMAs configured
+    """
+    return _pool.get(db_path)
+
+
+def read_connection(db_path: str = DB_PATH):
+    """
+    Check out a pooled read-only connection for db_path.
+    
+    Use as a context manager; the connection goes back to the pool on exit.
+    The database must already exist (see init_db).
     
     Args:
         db_path: Path to the SQLite database file
         
     Returns:
-        SQLite connection with row factory configured
+        Context manager yielding a read-only SQLite connection
     """
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return _read_pool.connection(db_path)
 
 
 def init_db(conn: sqlite3.Connection) -> None:
@@ -67,12 +229,10 @@ def init_users_table(conn: sqlite3.Connection) -> None:
     conn.commit()
     
     # Check if admin exists, if not create it
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) as count FROM users WHERE username = 'admin'")
-    result = cur.fetchone()
+    result = conn.execute("SELECT COUNT(*) as count FROM users WHERE username = 'admin'").fetchone()
     if result[0] == 0:
-        cur.execute(
+        conn.execute(
             "INSERT INTO users (username, password, role, created_by) VALUES (?, ?, ?, ?)",
-            ("admin", "admin", "admin", "system")
+            ("admin", hash_password("admin"), "admin", "system")
         )
         conn.commit()
@@ -78,6 +78,14 @@ def init_lab_tests_tables(conn: sqlite3.Connection) -> None:
     );
     """
     conn.execute(sql_patient_tests)
+    
+    # Indexes for the status and per-patient date lookups
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_lab_status ON {PATIENT_LAB_TESTS_TABLE}(test_status)"
+    )
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_lab_patient_date ON {PATIENT_LAB_TESTS_TABLE}(patient_id, test_date)"
+    )
     conn.commit()
     
     # Populate lab_tests with predefined tests if empty
@@ -91,9 +99,7 @@ def populate_lab_tests(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite database connection
     """
-    cur = conn.cursor()
-    cur.execute(f"SELECT COUNT(*) as count FROM {LAB_TESTS_TABLE}")
-    result = cur.fetchone()
+    result = conn.execute(f"SELECT COUNT(*) as count FROM {LAB_TESTS_TABLE}").fetchone()
     
     if result[0] == 0:
         # Categorize tests
@@ -106,7 +112,7 @@ def populate_lab_tests(conn: sqlite3.Connection) -> None:
         for category, tests in categories.items():
             for test in tests:
                 try:
-                    cur.execute(
+                    conn.execute(
                         f"INSERT INTO {LAB_TESTS_TABLE} (test_name, test_category) VALUES (?, ?)",
                         (test, category)
                     )
@@ -126,9 +132,7 @@ def get_all_lab_tests(conn: sqlite3.Connection) -> List[str]:
     Returns:
         List of test names
     """
-    cur = conn.cursor()
-    cur.execute(f"SELECT test_name FROM {LAB_TESTS_TABLE} ORDER BY test_name")
-    return [row[0] for row in cur.fetchall()]
+    return [row[0] for row in conn.execute(f"SELECT test_name FROM {LAB_TESTS_TABLE} ORDER BY test_name")]
 
 
 def get_lab_tests_by_category(conn: sqlite3.Connection) -> dict:
@@ -170,17 +174,49 @@ def order_lab_test(
     Returns:
         ID of the newly created lab test order
     """
-    cur = conn.cursor()
-    cur.execute(
-        f"""INSERT INTO {PATIENT_LAB_TESTS_TABLE} 
-        (patient_id, test_name, test_date, ordered_by, notes) 
-        VALUES (?, ?, ?, ?, ?)""",
-        (patient_id, test_name, test_date, ordered_by, notes)
-    )
-    conn.commit()
+    with conn:
+        cur = conn.execute(
+            f"""INSERT INTO {PATIENT_LAB_TESTS_TABLE} 
+            (patient_id, test_name, test_date, ordered_by, notes) 
+            VALUES (?, ?, ?, ?, ?)""",
+            (patient_id, test_name, test_date, ordered_by, notes)
+        )
     return cur.lastrowid
 
 
+def order_lab_tests_bulk(
+    conn: sqlite3.Connection,
+    patient_id: int,
+    test_names: List[str],
+    test_date: str,
+    ordered_by: str,
+    notes: Optional[str] = None
+) -> int:
+    """
+    Order several lab tests for a patient in a single transaction.
+    
+    Args:
+        conn: SQLite database connection
+        patient_id: ID of the patient
+        test_names: Names of the tests to order
+        test_date: Date when tests are scheduled
+        ordered_by: Username of person ordering the tests
+        notes: Optional notes applied to every order
+        
+    Returns:
+        Number of lab test orders created
+    """
+    rows = [(patient_id, test_name, test_date, ordered_by, notes) for test_name in test_names]
+    with conn:
+        conn.executemany(
+            f"""INSERT INTO {PATIENT_LAB_TESTS_TABLE} 
+            (patient_id, test_name, test_date, ordered_by, notes) 
+            VALUES (?, ?, ?, ?, ?)""",
+            rows
+        )
+    return len(rows)
+
+
 def update_lab_test_result(
     conn: sqlite3.Connection,
     test_id: int,
@@ -202,37 +238,53 @@ def update_lab_test_result(
         reference_range: Normal reference range
         notes: Additional notes
     """
-    conn.execute(
-        f"""UPDATE {PATIENT_LAB_TESTS_TABLE} 
-        SET test_status = ?, result_value = ?, result_unit = ?, 
-        reference_range = ?, notes = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?""",
-        (test_status, result_value, result_unit, reference_range, notes, test_id)
-    )
-    conn.commit()
+    with conn:
+        conn.execute(
+            f"""UPDATE {PATIENT_LAB_TESTS_TABLE} 
+            SET test_status = ?, result_value = ?, result_unit = ?, 
+            reference_range = ?, notes = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?""",
+            (test_status, result_value, result_unit, reference_range, notes, test_id)
+        )
 
 
-def fetch_patient_lab_tests(conn: sqlite3.Connection, patient_id: int) -> pd.DataFrame:
+def fetch_patient_lab_tests(
+    conn: sqlite3.Connection,
+    patient_id: int,
+    status: Optional[str] = None,
+    test_date: Optional[str] = None
+) -> pd.DataFrame:
     """
-    Fetch all lab tests for a specific patient.
+    Fetch lab tests for a specific patient, optionally filtered.
     
     Args:
         conn: SQLite database connection
         patient_id: ID of the patient
+        status: Only return tests with this status (optional)
+        test_date: Only return tests on this date, as YYYY-MM-DD (optional)
         
     Returns:
         DataFrame containing patient's lab tests
     """
+    conditions = ["plt.patient_id = ?"]
+    params: List[object] = [patient_id]
+    if status is not None:
+        conditions.append("plt.test_status = ?")
+        params.append(status)
+    if test_date is not None:
+        conditions.append("plt.test_date = ?")
+        params.append(test_date)
+    
     query = f"""
     SELECT 
         plt.*,
         p.first_name || ' ' || p.last_name as patient_name
     FROM {PATIENT_LAB_TESTS_TABLE} plt
     LEFT JOIN patients p ON plt.patient_id = p.id
-    WHERE plt.patient_id = ?
+    WHERE {' AND '.join(conditions)}
     ORDER BY plt.test_date DESC, plt.created_at DESC
     """
-    df = pd.read_sql_query(query, conn, params=(patient_id,))
+    df = pd.read_sql_query(query, conn, params=params)
     return df
 
 
@@ -259,6 +311,42 @@ def fetch_all_lab_tests_orders(conn: sqlite3.Connection) -> pd.DataFrame:
     return df
 
 
+def count_lab_test_orders(conn: sqlite3.Connection) -> int:
+    """
+    Count lab test orders without loading them.
+    
+    Args:
+        conn: SQLite database connection
+        
+    Returns:
+        Number of lab test orders
+    """
+    return conn.execute(f"SELECT COUNT(*) FROM {PATIENT_LAB_TESTS_TABLE}").fetchone()[0]
+
+
+def fetch_pending_lab_tests(conn: sqlite3.Connection) -> pd.DataFrame:
+    """
+    Fetch pending lab test orders with patient information.
+    
+    Args:
+        conn: SQLite database connection
+        
+    Returns:
+        DataFrame containing lab test orders with status 'Pending'
+    """
+    query = f"""
+    SELECT 
+        plt.*,
+        p.first_name || ' ' || p.last_name as patient_name
+    FROM {PATIENT_LAB_TESTS_TABLE} plt
+    LEFT JOIN patients p ON plt.patient_id = p.id
+    WHERE plt.test_status = 'Pending'
+    ORDER BY plt.test_date DESC, plt.created_at DESC
+    """
+    df = pd.read_sql_query(query, conn)
+    return df
+
+
 def delete_lab_test_order(conn: sqlite3.Connection, test_id: int) -> None:
     """
     Delete a lab test order.
@@ -267,8 +355,8 @@ def delete_lab_test_order(conn: sqlite3.Connection, test_id: int) -> None:
         conn: SQLite database connection
         test_id: ID of the lab test to delete
     """
-    conn.execute(f"DELETE FROM {PATIENT_LAB_TESTS_TABLE} WHERE id = ?", (test_id,))
-    conn.commit()
+    with conn:
+        conn.execute(f"DELETE FROM {PATIENT_LAB_TESTS_TABLE} WHERE id = ?", (test_id,))
 
 
 def fetch_lab_test_by_id(conn: sqlite3.Connection, test_id: int) -> Optional[dict]:
@@ -282,7 +370,5 @@ def fetch_lab_test_by_id(conn: sqlite3.Connection, test_id: int) -> Optional[dic
     Returns:
         Dictionary containing lab test data, or None if not found
     """
-    cur = conn.cursor()
-    cur.execute(f"SELECT * FROM {PATIENT_LAB_TESTS_TABLE} WHERE id = ?", (test_id,))
-    row = cur.fetchone()
+    row = conn.execute(f"SELECT * FROM {PATIENT_LAB_TESTS_TABLE} WHERE id = ?", (test_id,)).fetchone()
     return dict(row) if row else None
@@ -3,9 +3,10 @@ Database CRUD operations for patient management
 """
 
 import sqlite3
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 import pandas as pd
 from .connection import TABLE_NAME
+from .passwords import hash_password, is_password_hash, needs_rehash, verify_password
 
 
 def insert_patient(
@@ -30,15 +31,45 @@ def insert_patient(
     Returns:
         ID of the newly inserted patient record
     """
-    cur = conn.cursor()
-    cur.execute(
-        f"INSERT INTO {TABLE_NAME} (first_name, last_name, phone, email, address) VALUES (?, ?, ?, ?, ?)",
-        (first_name.strip(), last_name.strip(), phone.strip(), email.strip() if email else None, address.strip())
-    )
-    conn.commit()
+    with conn:
+        cur = conn.execute(
+            f"INSERT INTO {TABLE_NAME} (first_name, last_name, phone, email, address) VALUES (?, ?, ?, ?, ?)",
+            (first_name.strip(), last_name.strip(), phone.strip(), email.strip() if email else None, address.strip())
+        )
     return cur.lastrowid
 
 
+def insert_patients_bulk(
+    conn: sqlite3.Connection,
+    patients: Iterable[Tuple[str, str, str, Optional[str], str]]
+) -> int:
+    """
+    Insert many patient records in a single transaction.
+    
+    Args:
+        conn: SQLite database connection
+        patients: Tuples of (first_name, last_name, phone, email, address);
+            an empty email is stored as NULL
+        
+    Returns:
+        Number of patient records inserted
+    """
+    rows = [
+        (first_name.strip(), last_name.strip(), phone.strip(), email.strip() if email else None, address.strip())
+        for first_name, last_name, phone, email, address in patients
+    ]
+    with conn:
+        # Take the write lock up front so a large import cannot fail with
+        # "database is locked" halfway through when another session writes
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            f"INSERT INTO {TABLE_NAME} (first_name, last_name, phone, email, address) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+    return len(rows)
+
+
 def update_patient(
     conn: sqlite3.Connection,
     patient_id: int,
@@ -47,7 +78,7 @@ def update_patient(
     phone: str,
     email: Optional[str],
     address: str
-) -> None:
+) -> Optional[dict]:
     """
     Update an existing patient record.
     
@@ -59,12 +90,17 @@ def update_patient(
         phone: Updated phone number
         email: Updated email (optional)
         address: Updated address
+        
+    Returns:
+        Dictionary containing the updated patient record, or None if not found
     """
-    conn.execute(
-        f"UPDATE {TABLE_NAME} SET first_name = ?, last_name = ?, phone = ?, email = ?, address = ? WHERE id = ?",
-        (first_name.strip(), last_name.strip(), phone.strip(), email.strip() if email else None, address.strip(), patient_id)
-    )
-    conn.commit()
+    # RETURNING hands back the stored row without a follow-up SELECT
+    with conn:
+        row = conn.execute(
+            f"UPDATE {TABLE_NAME} SET first_name = ?, last_name = ?, phone = ?, email = ?, address = ? WHERE id = ? RETURNING *",
+            (first_name.strip(), last_name.strip(), phone.strip(), email.strip() if email else None, address.strip(), patient_id)
+        ).fetchone()
+    return dict(row) if row else None
 
 
 def delete_patient(conn: sqlite3.Connection, patient_id: int) -> None:
@@ -75,8 +111,8 @@ def delete_patient(conn: sqlite3.Connection, patient_id: int) -> None:
         conn: SQLite database connection
         patient_id: ID of the patient to delete
     """
-    conn.execute(f"DELETE FROM {TABLE_NAME} WHERE id = ?", (patient_id,))
-    conn.commit()
+    with conn:
+        conn.execute(f"DELETE FROM {TABLE_NAME} WHERE id = ?", (patient_id,))
 
 
 def fetch_all_patients(conn: sqlite3.Connection) -> pd.DataFrame:
@@ -87,12 +123,38 @@ def fetch_all_patients(conn: sqlite3.Connection) -> pd.DataFrame:
         conn: SQLite database connection
         
     Returns:
-        DataFrame containing all patient records, ordered by creation date (newest first)
+        DataFrame containing all patient records, newest first
     """
-    df = pd.read_sql_query(f"SELECT * FROM {TABLE_NAME} ORDER BY created_at DESC", conn)
+    # IDs grow with every insert, so rowid order is creation order without the
+    # ties of second-resolution timestamps, and needs no sort or extra index
+    df = pd.read_sql_query(f"SELECT * FROM {TABLE_NAME} ORDER BY id DESC", conn)
     return df
 
 
+def count_patients(conn: sqlite3.Connection) -> int:
+    """
+    Count patient records without loading them.
+    
+    Args:
+        conn: SQLite database connection
+        
+    Returns:
+        Number of patient records
+    """
+    return conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+
+
+def fetch_patients_fingerprint(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """
+    Cheap summary of the patients table for cache invalidation.
+    
+    Returns:
+        Tuple of (row count, highest patient ID); changes on any insert or delete
+    """
+    count, max_id = conn.execute(f"SELECT COUNT(*), COALESCE(MAX(id), 0) FROM {TABLE_NAME}").fetchone()
+    return count, max_id
+
+
 def fetch_patient_by_id(conn: sqlite3.Connection, patient_id: int) -> Optional[dict]:
     """
     Fetch a single patient record by ID.
@@ -104,9 +166,7 @@ def fetch_patient_by_id(conn: sqlite3.Connection, patient_id: int) -> Optional[d
     Returns:
         Dictionary containing patient data, or None if not found
     """
-    cur = conn.cursor()
-    cur.execute(f"SELECT * FROM {TABLE_NAME} WHERE id = ?", (patient_id,))
-    row = cur.fetchone()
+    row = conn.execute(f"SELECT * FROM {TABLE_NAME} WHERE id = ?", (patient_id,)).fetchone()
     return dict(row) if row else None
 
 
@@ -118,6 +178,9 @@ def authenticate_user(conn: sqlite3.Connection, username: str, password: str) ->
     """
     Authenticate a user by username and password.
     
+    Passwords are stored as Argon2 hashes. Accounts still holding a legacy
+    plain-text password are upgraded to a hash on their next successful login.
+    
     Args:
         conn: SQLite database connection
         username: User's username
@@ -126,10 +189,24 @@ def authenticate_user(conn: sqlite3.Connection, username: str, password: str) ->
     Returns:
         Dictionary containing user data if authenticated, None otherwise
     """
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE username = ? AND password = ?", (username.strip(), password))
-    row = cur.fetchone()
-    return dict(row) if row else None
+    row = conn.execute("SELECT * FROM users WHERE username = ?", (username.strip(),)).fetchone()
+    if not row:
+        return None
+    
+    stored = row["password"]
+    if is_password_hash(stored):
+        if not verify_password(stored, password):
+            return None
+        upgrade = needs_rehash(stored)
+    else:
+        if stored != password:
+            return None
+        upgrade = True
+    
+    if upgrade:
+        with conn:
+            conn.execute("UPDATE users SET password = ? WHERE id = ?", (hash_password(password), row["id"]))
+    return dict(row)
 
 
 def create_user(conn: sqlite3.Connection, username: str, password: str, created_by: str) -> int:
@@ -145,12 +222,11 @@ def create_user(conn: sqlite3.Connection, username: str, password: str, created_
     Returns:
         ID of the newly created user
     """
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO users (username, password, role, created_by) VALUES (?, ?, ?, ?)",
-        (username.strip(), password, "user", created_by)
-    )
-    conn.commit()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO users (username, password, role, created_by) VALUES (?, ?, ?, ?)",
+            (username.strip(), hash_password(password), "user", created_by)
+        )
     return cur.lastrowid
 
 
@@ -176,8 +252,8 @@ def delete_user(conn: sqlite3.Connection, user_id: int) -> None:
         conn: SQLite database connection
         user_id: ID of the user to delete
     """
-    conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
-    conn.commit()
+    with conn:
+        conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
 
 
 def user_exists(conn: sqlite3.Connection, username: str) -> bool:
@@ -191,7 +267,5 @@ def user_exists(conn: sqlite3.Connection, username: str) -> bool:
     Returns:
         True if username exists, False otherwise
     """
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) as count FROM users WHERE username = ?", (username.strip(),))
-    result = cur.fetchone()
+    result = conn.execute("SELECT COUNT(*) as count FROM users WHERE username = ?", (username.strip(),)).fetchone()
     return result[0] > 0
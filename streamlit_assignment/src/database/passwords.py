@@ -0,0 +1,49 @@
+"""
+Password hashing helpers for user authentication
+"""
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# Shared hasher so parameters are set up once rather than per call
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with Argon2id for storage.
+    
+    Args:
+        password: Plain-text password
+        
+    Returns:
+        Encoded Argon2 hash string
+    """
+    return _password_hasher.hash(password)
+
+
+def is_password_hash(stored: str) -> bool:
+    """Return True if a stored password is an Argon2 hash rather than legacy plain text."""
+    return stored.startswith("$argon2")
+
+
+def verify_password(stored: str, password: str) -> bool:
+    """
+    Check a password against its stored Argon2 hash.
+    
+    Args:
+        stored: Encoded hash from the users table
+        password: Plain-text password to check
+        
+    Returns:
+        True if the password matches, False otherwise
+    """
+    try:
+        return _password_hasher.verify(stored, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def needs_rehash(stored: str) -> bool:
+    """Return True if a stored hash was made with outdated parameters."""
+    return _password_hasher.check_needs_rehash(stored)
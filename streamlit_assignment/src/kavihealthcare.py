@@ -19,37 +19,40 @@ Features:
 - Simple validation and user feedback
 """
 
-from typing import Tuple
+import base64
+import hashlib
+import importlib.util
+import math
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import streamlit as st
-import validators
-from io import BytesIO
+import tempfile
 from datetime import datetime
 import os
 from whatsapp_sender import send_whatsapp_pdf
 
-# Import ReportLab for PDF generation
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+# ReportLab is imported on first use (see _reportlab); only probe for it here
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+if not REPORTLAB_AVAILABLE:
     print("Warning: reportlab not available. PDF generation will be disabled.")
 
 # Import database operations from separate package
 from database import (
     get_connection,
+    read_connection,
     init_db,
     init_users_table,
     insert_patient,
+    insert_patients_bulk,
     update_patient,
     delete_patient,
     fetch_all_patients,
+    fetch_patients_fingerprint,
     fetch_patient_by_id,
     authenticate_user,
     create_user,
@@ -59,38 +62,287 @@ from database import (
     init_lab_tests_tables,
     get_all_lab_tests,
     get_lab_tests_by_category,
-    order_lab_test,
+    order_lab_tests_bulk,
     update_lab_test_result,
     fetch_patient_lab_tests,
     fetch_all_lab_tests_orders,
-    delete_lab_test_order,
-    fetch_lab_test_by_id
+    fetch_pending_lab_tests,
+    delete_lab_test_order
 )
 
+PATIENTS_PAGE_SIZE = 50
+PATIENTS_PAGE_SIZE_OPTIONS = (25, 50, 100, 250)
+
+# Row cap for the raw database preview in the footer
+RAW_PREVIEW_ROWS = 500
+
+# Display headers for the patient table, keyed by DataFrame column
+PATIENT_DISPLAY_COLUMNS = {
+    "id": "ID",
+    "first_name": "First name",
+    "last_name": "Last name",
+    "phone": "Phone",
+    "email": "Email",
+    "address": "Address",
+    "created_at": "Created at",
+}
+
+# Display headers for lab test tables, keyed by DataFrame column
+LAB_TEST_DISPLAY_COLUMNS = {
+    "test_name": "Test Name",
+    "test_date": "Test Date",
+    "test_status": "Status",
+    "result_value": "Result",
+    "result_unit": "Unit",
+}
+
+LAB_ORDER_DISPLAY_COLUMNS = {
+    "id": "ID",
+    "patient_name": "Patient",
+    **LAB_TEST_DISPLAY_COLUMNS,
+    "ordered_by": "Ordered By",
+    "created_at": "Created At",
+}
+
 # -----------------------
 # Validation helpers
 # -----------------------
-def validate_phone(phone: str) -> Tuple[bool, str]:
-    s = phone.strip()
+# Translation table that deletes ASCII digits; the length drop is the digit count
+_STRIP_DIGITS = str.maketrans("", "", "0123456789")
+
+def _is_valid_phone(phone: str) -> bool:
     # Allow + and digits and spaces/hyphens. But require at least 7 digits (adjustable)
-    digits = "".join(ch for ch in s if ch.isdigit())
-    if len(digits) < 7 or len(digits) > 15:
+    return 7 <= len(phone) - len(phone.translate(_STRIP_DIGITS)) <= 15
+
+def validate_phone(phone: str) -> Tuple[bool, str]:
+    if not _is_valid_phone(phone):
         return False, "Phone must contain between 7 and 15 digits."
     # Simple pattern check
     return True, ""
 
+# local@domain.tld, with a dotted domain and an alphabetic TLD of 2+ letters
+EMAIL_RE = re.compile(r"^[^@\s]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\Z")
+
+def _is_valid_email(email: str) -> bool:
+    return EMAIL_RE.match(email) is not None
+
 def validate_email(email: str) -> Tuple[bool, str]:
     if email.strip() == "":
         return True, ""  # optional
-    if validators.email(email):
+    if _is_valid_email(email):
         return True, ""
     return False, "Invalid email address."
 
 # -----------------------
 # Utility helpers
 # -----------------------
+IMPORT_COLUMNS = ["first_name", "last_name", "phone", "email", "address"]
+
+def split_import_rows(csv_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Index]:
+    """
+    Validate uploaded patient rows in one pass instead of row by row.
+    
+    Returns:
+        Tuple of (valid rows as strings in IMPORT_COLUMNS order, index labels of rejected rows)
+    """
+    values = csv_df.rename(columns=str.lower).reindex(columns=IMPORT_COLUMNS).fillna("").astype(str)
+    # Whole-column string ops; same 7-15 digit rule as _is_valid_phone
+    ok_phone = values["phone"].str.count(r"[0-9]").between(7, 15)
+    # Email is optional; blank cells pass, the rest must match EMAIL_RE
+    ok_email = values["email"].str.strip().eq("") | values["email"].str.match(EMAIL_RE)
+    required = values[["first_name", "last_name", "address"]].apply(lambda col: col.str.strip().ne(""))
+    valid = (required.all(axis=1) & ok_phone & ok_email).to_numpy()
+    return values[valid], csv_df.index[~valid]
+
+IMPORT_CHUNK_ROWS = 10_000
+
+# Read every cell as text with no NA detection, so blanks arrive as ""
+# and numeric-looking phones keep their digits
+IMPORT_READ_OPTIONS = {"dtype": str, "na_filter": False}
+
+def import_patients_csv(conn, source, chunk_rows: int = IMPORT_CHUNK_ROWS) -> Tuple[int, List[int]]:
+    """
+    Validate and insert a patients CSV, parsing it `chunk_rows` rows at a time.
+    
+    All valid rows are inserted in one transaction, after the whole file has
+    parsed, so a malformed file imports nothing.
+    
+    Returns:
+        Tuple of (number of rows imported, index labels of rejected rows)
+    """
+    rejected: List[int] = []
+    
+    def valid_rows():
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, **IMPORT_READ_OPTIONS):
+            valid, bad = split_import_rows(chunk)
+            rejected.extend(bad)
+            yield from valid.itertuples(index=False, name=None)
+    
+    imported = insert_patients_bulk(conn, valid_rows())
+    return imported, rejected
+
+CSV_CHUNK_ROWS = 10_000
+
+def _csv_chunk(df: pd.DataFrame, include_header: bool) -> bytes:
+    """Serialize one slice of rows to CSV bytes, formatted exactly like DataFrame.to_csv."""
+    # Every chunk goes through the same writer, so a multi-chunk export reads as one file
+    return df.to_csv(index=False, header=include_header).encode("utf-8")
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield a DataFrame as UTF-8 CSV bytes, `chunk_rows` rows at a time, header first."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield _csv_chunk(df.iloc[start:start + chunk_rows], include_header=start == 0)
+
 def df_to_csv_bytes(df: pd.DataFrame) -> bytes:
-    return df.to_csv(index=False).encode("utf-8")
+    """Serialize a DataFrame to UTF-8 CSV bytes."""
+    # st.download_button needs the whole payload, so join the streamed chunks
+    return b"".join(iter_csv_chunks(df))
+
+def build_lab_order_search_index(orders: pd.DataFrame) -> dict:
+    """Lowercased text arrays for the View All Orders filters, aligned with `orders` rows."""
+    return {
+        "patient_name": np.char.lower(orders["patient_name"].fillna("").to_numpy(dtype=str)),
+        "test_name": np.char.lower(orders["test_name"].fillna("").to_numpy(dtype=str)),
+    }
+
+def filter_lab_orders(orders: pd.DataFrame, search_index: dict, patient: str = "", test: str = "", status: str = "All") -> pd.DataFrame:
+    """Apply the View All Orders filters as one combined boolean mask over the search index."""
+    mask = np.ones(len(orders), dtype=bool)
+    if patient:
+        mask &= np.char.find(search_index["patient_name"], patient.lower()) >= 0
+    if test:
+        mask &= np.char.find(search_index["test_name"], test.lower()) >= 0
+    if status != "All":
+        mask &= (orders["test_status"] == status).to_numpy()
+    return orders[mask]
+
+# -----------------------
+# Cached lookups
+# -----------------------
+@st.cache_resource
+def cached_lab_tests_by_category() -> dict:
+    """
+    Lab test catalog grouped by category, loaded once per app process.
+    
+    The catalog is seeded at init and never edited from the UI, so the dict is
+    shared read-only across sessions. Call .clear() if test definitions change.
+    """
+    with read_connection() as conn:
+        return get_lab_tests_by_category(conn)
+
+@st.cache_resource
+def _patients_version_holder() -> dict:
+    # Shared across sessions so one user's write invalidates everyone's cache
+    return {"version": 0}
+
+def bump_patients_version() -> None:
+    """Invalidate the cached patients frame after an in-app write."""
+    _patients_version_holder()["version"] += 1
+
+def build_patient_search_index(df: pd.DataFrame) -> dict:
+    """Lowercased text arrays for the sidebar filters, aligned with `df` rows."""
+    return {
+        "first_name": np.char.lower(df["first_name"].fillna("").to_numpy(dtype=str)),
+        "last_name": np.char.lower(df["last_name"].fillna("").to_numpy(dtype=str)),
+        "phone": df["phone"].fillna("").to_numpy(dtype=str),
+        "email": np.char.lower(df["email"].fillna("").to_numpy(dtype=str)),
+    }
+
+def filter_patients(df: pd.DataFrame, search_index: dict, name: str = "", phone: str = "", email: str = "") -> pd.DataFrame:
+    """
+    Apply the sidebar filters as literal substring matches over the search index.
+    
+    Name and email are case-insensitive, including non-ASCII letters. The View
+    tab's count, current page and CSV export are all taken from this result.
+    """
+    masks = []
+    if name:
+        needle = name.lower()
+        masks.append((np.char.find(search_index["first_name"], needle) >= 0) | (np.char.find(search_index["last_name"], needle) >= 0))
+    if phone:
+        masks.append(np.char.find(search_index["phone"], phone) >= 0)
+    if email:
+        masks.append(np.char.find(search_index["email"], email.lower()) >= 0)
+    if not masks:
+        return df
+    return df[np.logical_and.reduce(masks)]
+
+def lookup_patient(conn, df_all: pd.DataFrame, patient_id: int) -> Optional[dict]:
+    """
+    A patient record as a dict, served from the loaded frame when possible.
+    
+    Falls back to the database for IDs the frame doesn't have yet. Values are
+    plain Python objects with None for missing emails, like fetch_patient_by_id.
+    """
+    positions = np.flatnonzero(df_all["id"].to_numpy() == patient_id)
+    if not len(positions):
+        return fetch_patient_by_id(conn, patient_id)
+    row = df_all.iloc[positions[:1]].astype(object)
+    return row.where(row.notna(), None).to_dict("records")[0]
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def cached_all_patients(fingerprint: Tuple[int, int, int]) -> Tuple[pd.DataFrame, dict]:
+    """All patients plus their search index, cached until the table fingerprint changes."""
+    with read_connection() as conn:
+        df = fetch_all_patients(conn)
+    return df, build_patient_search_index(df)
+
+def patients_fingerprint(conn) -> Tuple[int, int, int]:
+    """Cache key for patient data: in-app write version plus row count and max ID."""
+    return (_patients_version_holder()["version"], *fetch_patients_fingerprint(conn))
+
+def load_all_patients(conn) -> Tuple[pd.DataFrame, dict]:
+    """
+    All patients and their search index, rebuilt only when the table changes.
+    
+    The key combines the in-app write version (covers edits, which leave the
+    row count alone) with the row count and max ID (covers outside writers).
+    """
+    return cached_all_patients(patients_fingerprint(conn))
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_patients_csv(fingerprint: Tuple[int, int, int], name: str, phone: str, email: str) -> bytes:
+    """Filtered patients CSV export, cached until the table fingerprint or filters change."""
+    # Same cached frame and filter as the table, so the export matches what is shown
+    df_all, search_index = cached_all_patients(fingerprint)
+    return df_to_csv_bytes(filter_patients(df_all, search_index, name, phone, email))
+
+@st.cache_resource
+def _lab_orders_version_holder() -> dict:
+    # Shared across sessions so one user's write invalidates everyone's cache
+    return {"version": 0}
+
+def lab_orders_version() -> int:
+    """Current version of the lab orders data, used as a cache key."""
+    return _lab_orders_version_holder()["version"]
+
+def bump_lab_orders_version() -> None:
+    """Invalidate cached lab order frames after a write to orders or patients."""
+    _lab_orders_version_holder()["version"] += 1
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_all_lab_orders(version: int) -> Tuple[pd.DataFrame, dict]:
+    """All lab orders with patient info plus their search index, cached per data version for up to 30 seconds."""
+    with read_connection() as conn:
+        orders = fetch_all_lab_tests_orders(conn)
+    return orders, build_lab_order_search_index(orders)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_pending_lab_orders(version: int) -> pd.DataFrame:
+    """Pending lab orders with patient info, cached per data version for up to 30 seconds."""
+    with read_connection() as conn:
+        return fetch_pending_lab_tests(conn)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_patient_lab_tests(
+    patient_id: int,
+    version: int,
+    status: Optional[str] = None,
+    test_date: Optional[str] = None,
+) -> pd.DataFrame:
+    """A patient's lab tests matching the filters, cached per data version for up to 30 seconds."""
+    with read_connection() as conn:
+        return fetch_patient_lab_tests(conn, patient_id, status=status, test_date=test_date)
 
 # -----------------------
 # Authentication UI
@@ -115,7 +367,9 @@ def login_page():
                 st.error("Please enter both username and password.")
             else:
                 conn = get_connection()
-                init_users_table(conn)
+                if not st.session_state.get("_users_table_ready"):
+                    init_users_table(conn)
+                    st.session_state["_users_table_ready"] = True
                 user = authenticate_user(conn, username, password)
                 
                 if user:
@@ -189,10 +443,11 @@ def user_management_section(conn):
                 deletable_users = users_df[users_df["username"] != "admin"]
                 if not deletable_users.empty:
                     st.markdown("#### Delete User")
+                    id_to_username = dict(zip(deletable_users["id"].tolist(), deletable_users["username"].tolist()))
                     selected_user_id = st.selectbox(
                         "Select user to delete",
-                        options=deletable_users["id"].tolist(),
-                        format_func=lambda x: deletable_users[deletable_users["id"] == x]["username"].values[0]
+                        options=list(id_to_username),
+                        format_func=id_to_username.__getitem__
                     )
                     
                     if st.button("🗑️ Delete Selected User", type="secondary"):
@@ -204,31 +459,39 @@ def user_management_section(conn):
 # -----------------------
 # PDF Generation Helper
 # -----------------------
-def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes:
+_PDF_SPOOL_MAX_SIZE = 1024 * 1024
+
+_REPORT_TEST_COLUMNS = [
+    "test_name", "test_date", "test_status", "result_value",
+    "result_unit", "reference_range", "notes"
+]
+
+
+def _format_result(result_value, result_unit) -> str:
+    """Format a result cell for the PDF report, showing 'Pending' when empty."""
+    result_display = f"{result_value or '-'} {result_unit or ''}".strip()
+    if result_display == '-':
+        return 'Pending'
+    return result_display
+
+
+@lru_cache(maxsize=None)
+def _reportlab() -> SimpleNamespace:
     """
-    Generate a PDF lab report for a patient.
+    Import ReportLab and build the report styles on first use.
     
-    Args:
-        patient_data: Dictionary containing patient information
-        tests_df: DataFrame containing lab test results
-        
-    Returns:
-        PDF file as bytes
+    Reruns that never produce a PDF skip the import entirely; the styles are
+    constant, so they are built once per process instead of per report.
     """
-    if not REPORTLAB_AVAILABLE:
-        raise ImportError("reportlab library is not installed. Please install it with: pip install reportlab")
-    
-    # Create PDF buffer
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-    
-    # Container for PDF elements
-    elements = []
-    
-    # Styles
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable
+    from reportlab.lib.enums import TA_CENTER
+
     styles = getSampleStyleSheet()
-    
-    # Custom styles
+
     title_style = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
@@ -238,7 +501,7 @@ def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes
         alignment=TA_CENTER,
         fontName='Helvetica-Bold'
     )
-    
+
     subtitle_style = ParagraphStyle(
         'CustomSubtitle',
         parent=styles['Normal'],
@@ -248,7 +511,7 @@ def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes
         alignment=TA_CENTER,
         fontName='Helvetica'
     )
-    
+
     heading_style = ParagraphStyle(
         'CustomHeading',
         parent=styles['Heading2'],
@@ -258,15 +521,103 @@ def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes
         spaceBefore=12,
         fontName='Helvetica-Bold'
     )
+
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor('#7f8c8d'),
+        alignment=TA_CENTER,
+        spaceAfter=4
+    )
+
+    patient_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#ecf0f1')),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c3e50')),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('PADDING', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white)
+    ])
+
+    # Per-report status colors are appended to a copy of this list
+    test_table_base_style = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('PADDING', (0, 0), (-1, -1), 6),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+    ]
+
+    status_colors = {
+        'Completed': colors.HexColor('#27ae60'),
+        'Pending': colors.HexColor('#f39c12'),
+        'Cancelled': colors.HexColor('#e74c3c'),
+    }
+
+    signature_table_style = TableStyle([
+        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 1), (-1, 1), 8),
+    ])
+
+    return SimpleNamespace(
+        colors=colors,
+        letter=letter,
+        inch=inch,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Table=Table,
+        TableStyle=TableStyle,
+        Paragraph=Paragraph,
+        Spacer=Spacer,
+        HRFlowable=HRFlowable,
+        title_style=title_style,
+        subtitle_style=subtitle_style,
+        heading_style=heading_style,
+        footer_style=footer_style,
+        patient_table_style=patient_table_style,
+        test_table_base_style=test_table_base_style,
+        status_colors=status_colors,
+        signature_table_style=signature_table_style,
+    )
+
+
+def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes:
+    """
+    Generate a PDF lab report for a patient.
+    
+    Args:
+        patient_data: Dictionary containing patient information
+        tests_df: DataFrame containing lab test results
+        
+    Returns:
+        PDF file as bytes
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("reportlab library is not installed. Please install it with: pip install reportlab")
+    rl = _reportlab()
+    
+    # Container for PDF elements
+    elements = []
     
     # Header
-    elements.append(Paragraph("🩺 KaviHealthCare", title_style))
-    elements.append(Paragraph("Laboratory Test Report", title_style))
-    elements.append(Paragraph("The Medical Innovation Lab of Tomorrow, Built Today", subtitle_style))
-    elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#2c3e50'), spaceAfter=20))
+    elements.append(rl.Paragraph("🩺 KaviHealthCare", rl.title_style))
+    elements.append(rl.Paragraph("Laboratory Test Report", rl.title_style))
+    elements.append(rl.Paragraph("The Medical Innovation Lab of Tomorrow, Built Today", rl.subtitle_style))
+    elements.append(rl.HRFlowable(width="100%", thickness=2, color=rl.colors.HexColor('#2c3e50'), spaceAfter=20))
     
     # Patient Information
-    elements.append(Paragraph("Patient Information", heading_style))
+    elements.append(rl.Paragraph("Patient Information", rl.heading_style))
     
     patient_info_data = [
         ["Patient ID:", str(patient_data['id'])],
@@ -277,112 +628,135 @@ def generate_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes
         ["Report Generated:", datetime.now().strftime("%B %d, %Y %I:%M %p")]
     ]
     
-    patient_table = Table(patient_info_data, colWidths=[2*inch, 4.5*inch])
-    patient_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c3e50')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('PADDING', (0, 0), (-1, -1), 8),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.white)
-    ]))
+    patient_table = rl.Table(patient_info_data, colWidths=[2*rl.inch, 4.5*rl.inch])
+    patient_table.setStyle(rl.patient_table_style)
     
     elements.append(patient_table)
-    elements.append(Spacer(1, 0.3*inch))
+    elements.append(rl.Spacer(1, 0.3*rl.inch))
     
     # Test Results
-    elements.append(Paragraph("Test Results", heading_style))
+    elements.append(rl.Paragraph("Test Results", rl.heading_style))
     
-    # Prepare test data for table
+    # Prepare test data for table from one object array instead of iterrows
+    test_rows = tests_df[_REPORT_TEST_COLUMNS].to_numpy(dtype=object)
     test_table_data = [['Test Name', 'Test Date', 'Status', 'Result', 'Reference Range', 'Notes']]
-    
-    for _, test in tests_df.iterrows():
-        result_display = f"{test['result_value'] or '-'} {test['result_unit'] or ''}".strip()
-        if result_display == '-':
-            result_display = 'Pending'
-        
-        test_table_data.append([
-            test['test_name'],
-            test['test_date'],
-            test['test_status'],
-            result_display,
-            test['reference_range'] or '-',
-            test['notes'][:30] + '...' if test['notes'] and len(test['notes']) > 30 else (test['notes'] or '-')
-        ])
+    test_table_data += [
+        [
+            test_name,
+            test_date,
+            test_status,
+            _format_result(result_value, result_unit),
+            reference_range or '-',
+            notes[:30] + '...' if notes and len(notes) > 30 else (notes or '-')
+        ]
+        for test_name, test_date, test_status, result_value, result_unit, reference_range, notes in test_rows
+    ]
     
     # Create test results table
-    test_table = Table(test_table_data, colWidths=[1.8*inch, 0.9*inch, 0.8*inch, 1*inch, 1.2*inch, 1*inch])
+    test_table = rl.Table(test_table_data, colWidths=[1.8*rl.inch, 0.9*rl.inch, 0.8*rl.inch, 1*rl.inch, 1.2*rl.inch, 1*rl.inch])
     
     # Style the test table
-    table_style = [
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('PADDING', (0, 0), (-1, -1), 6),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-    ]
+    table_style = list(rl.test_table_base_style)
     
-    # Add color coding for status
-    for i, row in enumerate(tests_df.itertuples(), start=1):
-        if row.test_status == 'Completed':
-            table_style.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor('#27ae60')))
-        elif row.test_status == 'Pending':
-            table_style.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor('#f39c12')))
-        elif row.test_status == 'Cancelled':
-            table_style.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor('#e74c3c')))
+    # Add color coding for status in one sweep (row 0 is the header)
+    table_style.extend(
+        ('TEXTCOLOR', (2, i), (2, i), color)
+        for i, color in enumerate(map(rl.status_colors.get, test_rows[:, 2]), start=1)
+        if color is not None
+    )
     
-    test_table.setStyle(TableStyle(table_style))
+    test_table.setStyle(rl.TableStyle(table_style))
     elements.append(test_table)
     
     # Signature section
-    elements.append(Spacer(1, 0.5*inch))
+    elements.append(rl.Spacer(1, 0.5*rl.inch))
     signature_data = [
         ["_" * 30, "_" * 30],
         ["Technician Signature", "Doctor Signature"],
         ["Date: _______________", "Date: _______________"]
     ]
     
-    signature_table = Table(signature_data, colWidths=[3*inch, 3*inch])
-    signature_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 1), (-1, 1), 8),
-    ]))
+    signature_table = rl.Table(signature_data, colWidths=[3*rl.inch, 3*rl.inch])
+    signature_table.setStyle(rl.signature_table_style)
     
     elements.append(signature_table)
     
     # Footer
-    elements.append(Spacer(1, 0.3*inch))
-    elements.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#2c3e50'), spaceBefore=10))
+    elements.append(rl.Spacer(1, 0.3*rl.inch))
+    elements.append(rl.HRFlowable(width="100%", thickness=1, color=rl.colors.HexColor('#2c3e50'), spaceBefore=10))
     
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#7f8c8d'),
-        alignment=TA_CENTER,
-        spaceAfter=4
-    )
+    elements.append(rl.Paragraph("<b>KaviHealthCare Laboratory</b>", rl.footer_style))
+    elements.append(rl.Paragraph(f"This is a computer-generated report. Total tests in report: {len(tests_df)}", rl.footer_style))
+    elements.append(rl.Paragraph("For any queries, please contact our lab at lab@kavihealthcare.com", rl.footer_style))
+    
+    # Build PDF into a spooled buffer: small reports stay in memory, large ones
+    # spill to disk instead of being held twice in RAM
+    with tempfile.SpooledTemporaryFile(max_size=_PDF_SPOOL_MAX_SIZE) as buffer:
+        doc = rl.SimpleDocTemplate(buffer, pagesize=rl.letter, topMargin=0.5*rl.inch, bottomMargin=0.5*rl.inch)
+        doc.build(elements)
+        buffer.seek(0)
+        return buffer.read()
+
+
+PDF_CACHE_SIZE = 8
+
+def get_lab_report_pdf(patient_data: dict, tests_df: pd.DataFrame) -> bytes:
+    """
+    Return the lab report PDF, reusing this session's copy when inputs are unchanged.
     
-    elements.append(Paragraph("<b>KaviHealthCare Laboratory</b>", footer_style))
-    elements.append(Paragraph(f"This is a computer-generated report. Total tests in report: {len(tests_df)}", footer_style))
-    elements.append(Paragraph("For any queries, please contact our lab at lab@kavihealthcare.com", footer_style))
+    Reruns in the Print Report tab would otherwise rebuild the same PDF. Entries
+    are keyed by patient ID plus a hash of the patient fields and test rows, so
+    edits or different filters produce a new report. The oldest of at most
+    PDF_CACHE_SIZE entries is evicted first.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr(sorted(patient_data.items())).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(tests_df, index=False).to_numpy().tobytes())
+    key = (patient_data["id"], digest.hexdigest())
     
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
+    cache = st.session_state.setdefault("_pdf_cache", {})
+    if key not in cache:
+        cache[key] = generate_lab_report_pdf(patient_data, tests_df)
+        while len(cache) > PDF_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    # Other consumers resolve the current report through this key instead of
+    # keeping their own reference to the bytes
+    st.session_state["pdf_cache_key"] = key
+    return cache[key]
+
+
+def pdf_viewer_html() -> str:
+    """
+    Build the iframe HTML for the current lab report PDF.
     
-    return buffer.getvalue()
+    The PDF is resolved from the session's PDF cache via the key recorded by
+    get_lab_report_pdf, so the bytes are held in one place only. Base64-encoding
+    is done once the viewer is open and kept until a different report is shown.
+    """
+    key = st.session_state["pdf_cache_key"]
+    cached = st.session_state.get("_pdf_viewer_html")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    b64_pdf = base64.b64encode(st.session_state["_pdf_cache"][key]).decode('utf-8')
+    html = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="100%" height="800" type="application/pdf"></iframe>'
+    st.session_state["_pdf_viewer_html"] = (key, html)
+    return html
+
+
+# -----------------------
+# WhatsApp sending
+# -----------------------
+@st.cache_resource
+def whatsapp_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for PDF uploads and Twilio calls."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="whatsapp")
+
+@st.fragment(run_every=1)
+def whatsapp_send_progress(future: Future) -> None:
+    """Poll a background WhatsApp send and rerun the app once it finishes."""
+    if future.done():
+        st.rerun()
+    st.info("📱 Sending WhatsApp message with PDF via Twilio...")
 
 
 # -----------------------
@@ -402,9 +776,12 @@ def main():
     st.set_page_config(page_title="Patient Profiles", page_icon="🩺", layout="wide")
 
     conn = get_connection()
-    init_db(conn)
-    init_users_table(conn)
-    init_lab_tests_tables(conn)
+    # Schema setup is idempotent; run it once per session instead of every rerun
+    if not st.session_state.get("_schema_ready"):
+        init_db(conn)
+        init_users_table(conn)
+        init_lab_tests_tables(conn)
+        st.session_state["_schema_ready"] = True
 
     # Header with logout button
     col1, col2 = st.columns([5, 1])
@@ -436,26 +813,24 @@ def main():
     # For search/filter
     st.sidebar.markdown("---")
     st.sidebar.header("Search / Filter")
-    q_name = st.sidebar.text_input("Name contains (first or last)")
-    q_phone = st.sidebar.text_input("Phone contains")
-    q_email = st.sidebar.text_input("Email contains")
-    apply_filter = st.sidebar.button("Apply filters")
+    # Inputs live in a form so typing doesn't rerun the app; values are only
+    # committed (and stay applied on later reruns) when "Apply filters" is clicked
+    with st.sidebar.form("patient_filters"):
+        q_name = st.text_input("Name contains (first or last)")
+        q_phone = st.text_input("Phone contains")
+        q_email = st.text_input("Email contains")
+        page_size = st.selectbox(
+            "Rows per page",
+            options=PATIENTS_PAGE_SIZE_OPTIONS,
+            index=PATIENTS_PAGE_SIZE_OPTIONS.index(PATIENTS_PAGE_SIZE)
+        )
+        st.form_submit_button("Apply filters")
 
     # Load data
-    df_all = fetch_all_patients(conn)
-
-    # Apply filtering if requested or if any field non-empty
-    if apply_filter or any([q_name, q_phone, q_email]):
-        df = df_all.copy()
-        if q_name:
-            mask = df["first_name"].str.contains(q_name, case=False, na=False) | df["last_name"].str.contains(q_name, case=False, na=False)
-            df = df[mask]
-        if q_phone:
-            df = df[df["phone"].str.contains(q_phone, na=False)]
-        if q_email:
-            df = df[df["email"].fillna("").str.contains(q_email, case=False, na=False)]
-    else:
-        df = df_all
+    df_all, patient_search = load_all_patients(conn)
+
+    # Apply filtering only for non-empty filters: combine their masks and slice once
+    df = filter_patients(df_all, patient_search, q_name, q_phone, q_email)
 
     # ---------- Add patient ----------
     if action == "Add patient":
@@ -493,9 +868,10 @@ def main():
                         st.error(e)
                 else:
                     pid = insert_patient(conn, first_name, last_name, phone, email or None, address)
+                    bump_patients_version()
                     st.success(f"Patient added (ID: {pid})")
                     # refresh df
-                    df_all = fetch_all_patients(conn)
+                    df_all, patient_search = load_all_patients(conn)
                     df = df_all
 
     # ---------- View & manage ----------
@@ -507,7 +883,7 @@ def main():
         col_top[0].write(f"**Total records:** {len(df_all)}")
         col_top[1].write(f"**Showing:** {len(df)}")
         if not df.empty:
-            csv_bytes = df_to_csv_bytes(df)
+            csv_bytes = cached_patients_csv(patients_fingerprint(conn), q_name, q_phone, q_email)
             col_top[2].download_button("Download visible as CSV", data=csv_bytes, file_name="patients_export.csv", mime="text/csv", key="download_patients_csv")
 
         st.markdown("---")
@@ -515,17 +891,12 @@ def main():
             st.info("No patient records to show.")
         else:
             # Display table
-            # Show limited columns
-            display_df = df[["id", "first_name", "last_name", "phone", "email", "address", "created_at"]].copy()
-            display_df = display_df.rename(columns={
-                "id": "ID",
-                "first_name": "First name",
-                "last_name": "Last name",
-                "phone": "Phone",
-                "email": "Email",
-                "address": "Address",
-                "created_at": "Created at"
-            })
+            # Page count and rows both come from the filtered frame; only the
+            # current page is sent to the browser
+            page_count = max(1, math.ceil(len(df) / page_size))
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="patients_page")
+            page_df = df.iloc[(page - 1) * page_size:page * page_size]
+            display_df = page_df.rename(columns=PATIENT_DISPLAY_COLUMNS, copy=False)
             st.dataframe(display_df, use_container_width=True, height=300)
 
             st.markdown("**Select a patient to edit or delete**")
@@ -540,7 +911,7 @@ def main():
             if selected_id_input:
                 try:
                     selected_id = int(selected_id_input)
-                    selected = fetch_patient_by_id(conn, selected_id)
+                    selected = lookup_patient(conn, df_all, selected_id)
                     if not selected:
                         st.error(f"❌ No patient found with ID: {selected_id}")
                 except ValueError:
@@ -579,15 +950,19 @@ def main():
                                 st.error(e)
                         else:
                             update_patient(conn, selected["id"], e_first, e_last, e_phone, e_email or None, e_address)
+                            bump_patients_version()
+                            bump_lab_orders_version()
                             st.success("Patient updated.")
-                            df_all = fetch_all_patients(conn)
+                            df_all, patient_search = load_all_patients(conn)
                             df = df_all
 
                 st.markdown("#### Danger zone")
                 if st.button("Delete this patient"):
                     delete_patient(conn, selected["id"])
+                    bump_patients_version()
+                    bump_lab_orders_version()
                     st.warning("Patient deleted.")
-                    df_all = fetch_all_patients(conn)
+                    df_all, patient_search = load_all_patients(conn)
                     df = df_all
 
     # ---------- Lab Tests ----------
@@ -616,7 +991,7 @@ def main():
                 if patient_id_input:
                     try:
                         patient_id = int(patient_id_input)
-                        patient_data = fetch_patient_by_id(conn, patient_id)
+                        patient_data = lookup_patient(conn, df_all, patient_id)
                         
                         if patient_data:
                             selected_patient = patient_id
@@ -644,7 +1019,7 @@ def main():
                         st.markdown("#### Step 2: Select Tests")
                         
                         # Get tests by category
-                        tests_by_category = get_lab_tests_by_category(conn)
+                        tests_by_category = cached_lab_tests_by_category()
                         
                         selected_tests = []
                         
@@ -680,17 +1055,15 @@ def main():
                             if not selected_tests:
                                 st.error("Please select at least one test.")
                             else:
-                                ordered_count = 0
-                                for test_name in selected_tests:
-                                    order_lab_test(
-                                        conn,
-                                        selected_patient,
-                                        test_name,
-                                        str(test_date),
-                                        st.session_state["username"],
-                                        notes
-                                    )
-                                    ordered_count += 1
+                                ordered_count = order_lab_tests_bulk(
+                                    conn,
+                                    selected_patient,
+                                    selected_tests,
+                                    str(test_date),
+                                    st.session_state["username"],
+                                    notes
+                                )
+                                bump_lab_orders_version()
                                 st.success(f"Successfully ordered {ordered_count} test(s) for patient ID {selected_patient}!")
                 else:
                     st.info("👆 Enter a patient ID above to start ordering lab tests")
@@ -698,7 +1071,7 @@ def main():
         with lab_tab2:
             st.markdown("### All Lab Test Orders")
             
-            all_orders = fetch_all_lab_tests_orders(conn)
+            all_orders, order_search = cached_all_lab_orders(lab_orders_version())
             
             if all_orders.empty:
                 st.info("No lab test orders found.")
@@ -713,35 +1086,14 @@ def main():
                     filter_status = st.selectbox("Filter by status", ["All", "Pending", "Completed", "Cancelled"])
                 
                 # Apply filters
-                filtered_orders = all_orders.copy()
-                if filter_patient:
-                    filtered_orders = filtered_orders[
-                        filtered_orders["patient_name"].str.contains(filter_patient, case=False, na=False)
-                    ]
-                if filter_test:
-                    filtered_orders = filtered_orders[
-                        filtered_orders["test_name"].str.contains(filter_test, case=False, na=False)
-                    ]
-                if filter_status != "All":
-                    filtered_orders = filtered_orders[filtered_orders["test_status"] == filter_status]
+                filtered_orders = filter_lab_orders(all_orders, order_search, filter_patient, filter_test, filter_status)
                 
                 st.write(f"**Total orders:** {len(all_orders)} | **Showing:** {len(filtered_orders)}")
                 
                 # Display table
-                display_cols = ["id", "patient_name", "test_name", "test_date", "test_status", 
-                               "result_value", "result_unit", "ordered_by", "created_at"]
-                display_df = filtered_orders[display_cols].copy()
-                display_df = display_df.rename(columns={
-                    "id": "ID",
-                    "patient_name": "Patient",
-                    "test_name": "Test Name",
-                    "test_date": "Test Date",
-                    "test_status": "Status",
-                    "result_value": "Result",
-                    "result_unit": "Unit",
-                    "ordered_by": "Ordered By",
-                    "created_at": "Created At"
-                })
+                display_df = filtered_orders[list(LAB_ORDER_DISPLAY_COLUMNS)].rename(
+                    columns=LAB_ORDER_DISPLAY_COLUMNS, copy=False
+                )
                 
                 st.dataframe(display_df, use_container_width=True, height=400)
                 
@@ -758,74 +1110,86 @@ def main():
         with lab_tab3:
             st.markdown("### Update Lab Test Results")
             
-            all_orders = fetch_all_lab_tests_orders(conn)
+            pending_orders = cached_pending_lab_orders(lab_orders_version())
             
-            if all_orders.empty:
-                st.info("No lab test orders found.")
+            if pending_orders.empty:
+                st.info("No pending tests to update.")
             else:
-                # Filter to show pending tests
-                pending_orders = all_orders[all_orders["test_status"] == "Pending"]
+                # Full rows keyed by id; missing values become None like a DB fetch
+                pending_lookup = (
+                    pending_orders.astype(object)
+                    .where(pending_orders.notna(), None)
+                    .set_index("id", drop=False)
+                    .to_dict("index")
+                )
+                # Build every option label in one vectorized pass
+                option_labels = dict(zip(
+                    pending_lookup,
+                    (
+                        "ID " + pending_orders["id"].astype(str)
+                        + ": " + pending_orders["patient_name"].astype(str)
+                        + " - " + pending_orders["test_name"].astype(str)
+                        + " (" + pending_orders["test_date"].astype(str) + ")"
+                    ).to_numpy()
+                ))
+                selected_test_id = st.selectbox(
+                    "Select Test to Update",
+                    options=list(option_labels),
+                    format_func=option_labels.__getitem__
+                )
                 
-                if pending_orders.empty:
-                    st.info("No pending tests to update.")
-                else:
-                    selected_test_id = st.selectbox(
-                        "Select Test to Update",
-                        options=pending_orders["id"].tolist(),
-                        format_func=lambda x: f"ID {x}: {pending_orders[pending_orders['id'] == x]['patient_name'].values[0]} - {pending_orders[pending_orders['id'] == x]['test_name'].values[0]} ({pending_orders[pending_orders['id'] == x]['test_date'].values[0]})"
-                    )
-                    
-                    selected_test_data = fetch_lab_test_by_id(conn, selected_test_id)
+                selected_test_data = pending_lookup.get(selected_test_id)
+                
+                if selected_test_data:
+                    st.markdown(f"**Patient ID:** {selected_test_data['patient_id']}")
+                    st.markdown(f"**Test:** {selected_test_data['test_name']}")
+                    st.markdown(f"**Test Date:** {selected_test_data['test_date']}")
+                    st.markdown(f"**Current Status:** {selected_test_data['test_status']}")
                     
-                    if selected_test_data:
-                        st.markdown(f"**Patient ID:** {selected_test_data['patient_id']}")
-                        st.markdown(f"**Test:** {selected_test_data['test_name']}")
-                        st.markdown(f"**Test Date:** {selected_test_data['test_date']}")
-                        st.markdown(f"**Current Status:** {selected_test_data['test_status']}")
+                    with st.form("update_result_form"):
+                        new_status = st.selectbox(
+                            "Status",
+                            options=["Pending", "Completed", "Cancelled"],
+                            index=["Pending", "Completed", "Cancelled"].index(selected_test_data["test_status"])
+                        )
                         
-                        with st.form("update_result_form"):
-                            new_status = st.selectbox(
-                                "Status",
-                                options=["Pending", "Completed", "Cancelled"],
-                                index=["Pending", "Completed", "Cancelled"].index(selected_test_data["test_status"])
-                            )
-                            
-                            result_value = st.text_input(
-                                "Result Value",
-                                value=selected_test_data["result_value"] or ""
-                            )
-                            
-                            result_unit = st.text_input(
-                                "Result Unit (e.g., mg/dL, mmol/L)",
-                                value=selected_test_data["result_unit"] or ""
-                            )
-                            
-                            reference_range = st.text_input(
-                                "Reference Range (e.g., 70-100 mg/dL)",
-                                value=selected_test_data["reference_range"] or ""
-                            )
-                            
-                            update_notes = st.text_area(
-                                "Additional Notes",
-                                value=selected_test_data["notes"] or "",
-                                max_chars=500
+                        result_value = st.text_input(
+                            "Result Value",
+                            value=selected_test_data["result_value"] or ""
+                        )
+                        
+                        result_unit = st.text_input(
+                            "Result Unit (e.g., mg/dL, mmol/L)",
+                            value=selected_test_data["result_unit"] or ""
+                        )
+                        
+                        reference_range = st.text_input(
+                            "Reference Range (e.g., 70-100 mg/dL)",
+                            value=selected_test_data["reference_range"] or ""
+                        )
+                        
+                        update_notes = st.text_area(
+                            "Additional Notes",
+                            value=selected_test_data["notes"] or "",
+                            max_chars=500
+                        )
+                        
+                        submit_update = st.form_submit_button("Update Test Result")
+                        
+                        if submit_update:
+                            update_lab_test_result(
+                                conn,
+                                selected_test_id,
+                                new_status,
+                                result_value if result_value else None,
+                                result_unit if result_unit else None,
+                                reference_range if reference_range else None,
+                                update_notes if update_notes else None
                             )
-                            
-                            submit_update = st.form_submit_button("Update Test Result")
-                            
-                            if submit_update:
-                                update_lab_test_result(
-                                    conn,
-                                    selected_test_id,
-                                    new_status,
-                                    result_value if result_value else None,
-                                    result_unit if result_unit else None,
-                                    reference_range if reference_range else None,
-                                    update_notes if update_notes else None
-                                )
-                                st.success("Test result updated successfully!")
-                                st.rerun()
-        
+                            bump_lab_orders_version()
+                            st.success("Test result updated successfully!")
+                            st.rerun()
+    
         with lab_tab4:
             st.markdown("### 🖨️ Print Lab Test Report")
             
@@ -840,36 +1204,38 @@ def main():
             if report_patient_id:
                 try:
                     patient_id = int(report_patient_id)
-                    patient_data = fetch_patient_by_id(conn, patient_id)
+                    patient_data = lookup_patient(conn, df_all, patient_id)
                     
                     if patient_data:
-                        # Fetch patient's lab tests
-                        patient_tests = fetch_patient_lab_tests(conn, patient_id)
+                        # Filter options
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            status_filter = st.selectbox(
+                                "Filter by Status",
+                                options=["All", "Completed", "Pending", "Cancelled"],
+                                key="report_status_filter"
+                            )
+                        with col2:
+                            date_filter = st.date_input(
+                                "Filter by Test Date (optional)",
+                                value=None,
+                                key="report_date_filter"
+                            )
+                        filters_active = status_filter != "All" or bool(date_filter)
+                        
+                        # Fetch only the patient's tests that match the filters
+                        filtered_tests = cached_patient_lab_tests(
+                            patient_id,
+                            lab_orders_version(),
+                            status=None if status_filter == "All" else status_filter,
+                            test_date=date_filter.isoformat() if date_filter else None,
+                        )
                         
-                        if patient_tests.empty:
+                        if filtered_tests.empty and not filters_active:
                             st.warning(f"No lab tests found for Patient ID: {patient_id}")
                         else:
-                            # Filter options
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                status_filter = st.selectbox(
-                                    "Filter by Status",
-                                    options=["All", "Completed", "Pending", "Cancelled"],
-                                    key="report_status_filter"
-                                )
-                            with col2:
-                                date_filter = st.date_input(
-                                    "Filter by Test Date (optional)",
-                                    value=None,
-                                    key="report_date_filter"
-                                )
-                            
-                            # Apply filters
-                            filtered_tests = patient_tests.copy()
-                            if status_filter != "All":
-                                filtered_tests = filtered_tests[filtered_tests["test_status"] == status_filter]
-                            if date_filter:
-                                filtered_tests = filtered_tests[filtered_tests["test_date"] == str(date_filter)]
+                            # Count statuses once for the metrics and the WhatsApp summary
+                            status_counts = filtered_tests["test_status"].value_counts()
                             
                             if filtered_tests.empty:
                                 st.info("No tests match the selected filters.")
@@ -881,64 +1247,81 @@ def main():
                                     st.error("❌ PDF generation is not available.")
                                     st.error("Please install reportlab: `pip install reportlab`")
                                     st.info("You can still view the test data below:")
-                                    display_cols = ["test_name", "test_date", "test_status", "result_value", "result_unit"]
-                                    display_df = filtered_tests[display_cols].copy()
-                                    display_df.columns = ["Test Name", "Test Date", "Status", "Result", "Unit"]
+                                    display_df = filtered_tests[list(LAB_TEST_DISPLAY_COLUMNS)].rename(
+                                        columns=LAB_TEST_DISPLAY_COLUMNS, copy=False
+                                    )
                                     st.dataframe(display_df, use_container_width=True, height=300)
                                 else:
-                                    # Generate PDF
                                     try:
-                                        pdf_bytes = generate_lab_report_pdf(patient_data, filtered_tests)
+                                        # The WhatsApp form holds the phone and name of the patient it
+                                        # was opened for; close it when another patient is selected so
+                                        # this report can't go to that recipient
+                                        if (
+                                            st.session_state.get("whatsapp_mode", False)
+                                            and st.session_state.get("patient_id_for_whatsapp") != patient_id
+                                        ):
+                                            st.session_state["whatsapp_mode"] = False
+                                            st.session_state["sending_status"] = None
+                                            st.session_state.pop("whatsapp_future", None)
                                         
-                                        # Display PDF preview info
-                                        st.info("📄 PDF Report generated successfully!")
+                                        # Only build the PDF once an action needs it; browsing
+                                        # patients and filters costs no reportlab work. A
+                                        # "Prepare" request only covers the report it was made for
+                                        report_key = (patient_id, status_filter, date_filter)
+                                        pdf_needed = (
+                                            st.session_state.get("report_pdf_requested") == report_key
+                                            or st.session_state.get("show_pdf_viewer", False)
+                                            or st.session_state.get("whatsapp_mode", False)
+                                        )
+                                        pdf_bytes = get_lab_report_pdf(patient_data, filtered_tests) if pdf_needed else None
                                         
-                                        # Show summary
+                                        if pdf_bytes is not None:
+                                            st.info("📄 PDF Report generated successfully!")
+                                        
+                                        # Name the report once per patient so every rerun and the
+                                        # WhatsApp upload share it
+                                        report_filename = st.session_state.setdefault(
+                                            f"_report_name_{patient_id}",
+                                            f"lab_report_patient_{patient_id}_{datetime.now():%Y%m%d_%H%M%S}.pdf"
+                                        )
+                                        
+                                        # Summary metrics and report actions share a single row
                                         st.markdown("### Report Summary")
-                                        col1, col2, col3 = st.columns(3)
+                                        col1, col2, col3, col4, col5, col6 = st.columns(6)
                                         with col1:
                                             st.metric("Patient ID", patient_data['id'])
                                         with col2:
                                             st.metric("Total Tests", len(filtered_tests))
                                         with col3:
-                                            completed = len(filtered_tests[filtered_tests['test_status'] == 'Completed'])
-                                            st.metric("Completed", completed)
-                                        
-                                        st.markdown("---")
-                                        
-                                        # Download and Send Options
-                                        st.markdown("### Send Report to Patient")
+                                            st.metric("Completed", int(status_counts.get("Completed", 0)))
                                         
                                         # Action buttons
-                                        col1, col2, col3 = st.columns(3)
-                                        with col1:
-                                            st.download_button(
-                                                label="📥 Download PDF Report",
-                                                data=pdf_bytes,
-                                                file_name=f"lab_report_patient_{patient_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                                                mime="application/pdf",
-                                                use_container_width=True,
-                                                type="secondary",
-                                                key=f"download_pdf_report_{patient_id}"
-                                            )
+                                        with col4:
+                                            if pdf_bytes is None:
+                                                if st.button("📄 Prepare PDF Report", use_container_width=True, type="secondary"):
+                                                    st.session_state["report_pdf_requested"] = report_key
+                                                    st.rerun()
+                                            else:
+                                                st.download_button(
+                                                    label="📥 Download PDF Report",
+                                                    data=pdf_bytes,
+                                                    file_name=report_filename,
+                                                    mime="application/pdf",
+                                                    use_container_width=True,
+                                                    type="secondary",
+                                                    key=f"download_pdf_report_{patient_id}"
+                                                )
                                         
                                         # View/Print PDF button
-                                        with col2:
-                                            import base64
-                                            b64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-                                            pdf_display = f'<iframe src="data:application/pdf;base64,{b64_pdf}" width="100%" height="800" type="application/pdf"></iframe>'
-                                            
+                                        with col5:
                                             if st.button("👁️ View/Print PDF", use_container_width=True, type="secondary"):
                                                 st.session_state["show_pdf_viewer"] = True
-                                                st.session_state["pdf_display_html"] = pdf_display
                                                 st.rerun()
                                         
                                         # WhatsApp Send Option
-                                        with col3:
-                                            # Store PDF in session for WhatsApp send
+                                        with col6:
                                             if st.button("📱 Send via WhatsApp", use_container_width=True, type="primary"):
                                                 st.session_state["whatsapp_mode"] = True
-                                                st.session_state["pdf_data"] = pdf_bytes
                                                 st.session_state["patient_phone"] = patient_data['phone']
                                                 st.session_state["patient_name"] = f"{patient_data['first_name']} {patient_data['last_name']}"
                                                 st.session_state["patient_id_for_whatsapp"] = patient_id
@@ -951,7 +1334,7 @@ def main():
                                             st.info("💡 Use your browser's print function (Ctrl+P / Cmd+P) to print this report directly")
                                             
                                             # Display PDF
-                                            st.markdown(st.session_state.get("pdf_display_html", ""), unsafe_allow_html=True)
+                                            st.markdown(pdf_viewer_html(), unsafe_allow_html=True)
                                             
                                             # Close viewer button
                                             if st.button("✖️ Close Viewer", use_container_width=True):
@@ -972,8 +1355,8 @@ def main():
                                                 )
                                                 
                                                 # Report summary message
-                                                completed_tests = len(filtered_tests[filtered_tests['test_status'] == 'Completed'])
-                                                pending_tests = len(filtered_tests[filtered_tests['test_status'] == 'Pending'])
+                                                completed_tests = int(status_counts.get("Completed", 0))
+                                                pending_tests = int(status_counts.get("Pending", 0))
                                                 
                                                 default_message = f"""Dear {st.session_state.get("patient_name", "Patient")},
 
@@ -1008,6 +1391,7 @@ KaviHealthCare Team"""
                                             if cancel_whatsapp:
                                                 st.session_state["whatsapp_mode"] = False
                                                 st.session_state["sending_status"] = None
+                                                st.session_state.pop("whatsapp_future", None)
                                                 st.rerun()
                                             
                                             if send_whatsapp:
@@ -1019,24 +1403,29 @@ KaviHealthCare Team"""
                                                     if not clean_phone.startswith('+'):
                                                         clean_phone = '+' + ''.join(filter(str.isdigit, clean_phone))
                                                     
-                                                    # Show processing message
-                                                    with st.spinner("📱 Sending WhatsApp message with PDF via Twilio..."):
-                                                        try:
-                                                            # Get PDF data from session
-                                                            pdf_data = st.session_state.get("pdf_data", b'')
-                                                            patient_id_temp = st.session_state.get("patient_id_for_whatsapp", patient_id)
-                                                            pdf_filename = f"lab_report_patient_{patient_id_temp}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                                                            
-                                                            # Send via Twilio WhatsApp API
-                                                            success, result_message = send_whatsapp_pdf(
-                                                                to_phone=clean_phone,
-                                                                pdf_bytes=pdf_data,
-                                                                message_text=message_text,
-                                                                pdf_filename=pdf_filename
-                                                            )
-                                                            
-                                                            if success:
-                                                                st.success(f"""
+                                                    # Upload and send in the background so the page stays responsive
+                                                    st.session_state["whatsapp_future"] = whatsapp_executor().submit(
+                                                        send_whatsapp_pdf,
+                                                        to_phone=clean_phone,
+                                                        pdf_bytes=pdf_bytes,
+                                                        message_text=message_text,
+                                                        pdf_filename=report_filename
+                                                    )
+                                                    st.session_state["whatsapp_send_info"] = clean_phone
+                                                    st.session_state["sending_status"] = "sending"
+                                                    st.rerun()
+                                            
+                                            # Show the outcome of a background send
+                                            whatsapp_future = st.session_state.get("whatsapp_future")
+                                            if whatsapp_future is not None and not whatsapp_future.done():
+                                                whatsapp_send_progress(whatsapp_future)
+                                            elif whatsapp_future is not None:
+                                                clean_phone = st.session_state["whatsapp_send_info"]
+                                                try:
+                                                    success, result_message = whatsapp_future.result()
+                                                    
+                                                    if success:
+                                                        st.success(f"""
 ✅ WhatsApp message sent successfully!
 
 **Details:**
@@ -1045,21 +1434,10 @@ KaviHealthCare Team"""
 - Message delivered via Twilio WhatsApp API
 
 The report should be delivered to the patient within seconds.
-                                                                """)
-                                                                
-                                                                # Provide download option as backup
-                                                                st.download_button(
-                                                                    label="📥 Download PDF Again (if needed)",
-                                                                    data=pdf_data,
-                                                                    file_name=pdf_filename,
-                                                                    mime="application/pdf",
-                                                                    use_container_width=True,
-                                                                    key=f"download_pdf_backup_{st.session_state.get('patient_id_for_whatsapp', patient_id)}"
-                                                                )
-                                                                
-                                                                st.session_state["sending_status"] = "sent"
-                                                            else:
-                                                                st.error(f"""
+                                                        """)
+                                                        st.session_state["sending_status"] = "sent"
+                                                    else:
+                                                        st.error(f"""
 ❌ Failed to send WhatsApp message
 
 **Error:** {result_message}
@@ -1070,53 +1448,33 @@ The report should be delivered to the patient within seconds.
 - Ensure your Twilio WhatsApp sender number is configured
 - Check that your Twilio account has WhatsApp enabled
 
-Download the PDF below and send manually if needed.
-                                                                """)
-                                                                
-                                                                # Provide download option on error
-                                                                st.download_button(
-                                                                    label="📥 Download PDF Report",
-                                                                    data=pdf_data,
-                                                                    file_name=pdf_filename,
-                                                                    mime="application/pdf",
-                                                                    use_container_width=True,
-                                                                    key=f"download_pdf_error_{st.session_state.get('patient_id_for_whatsapp', patient_id)}"
-                                                                )
-                                                            
-                                                        except Exception as e:
-                                                            st.error(f"""
+Use the Download PDF Report button above to send it manually if needed.
+                                                        """)
+                                                except Exception as e:
+                                                    st.error(f"""
 ❌ Unexpected error: {str(e)}
 
 **Troubleshooting:**
 - Ensure Twilio library is installed: `pip install twilio`
 - Check your internet connection
 - Verify Twilio credentials are set correctly
-- Download the PDF below and send manually
-                                                            """)
-                                                            
-                                                            # Provide download option on error
-                                                            st.download_button(
-                                                                label="📥 Download PDF Report",
-                                                                data=st.session_state.get("pdf_data", b''),
-                                                                file_name=f"lab_report_patient_{st.session_state.get('patient_id_for_whatsapp', patient_id)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                                                                mime="application/pdf",
-                                                                use_container_width=True,
-                                                                key=f"download_pdf_error_{st.session_state.get('patient_id_for_whatsapp', patient_id)}"
-                                                            )
+- Use the Download PDF Report button above to send manually
+                                                    """)
                                             
                                             # Close button
                                             if st.session_state.get("sending_status") == "sent":
                                                 if st.button("✅ Done", use_container_width=True, type="primary"):
                                                     st.session_state["whatsapp_mode"] = False
                                                     st.session_state["sending_status"] = None
+                                                    st.session_state.pop("whatsapp_future", None)
                                                     st.rerun()
                                         
                                         # Show test details
                                         st.markdown("---")
                                         st.markdown("### Tests Included in Report")
-                                        display_cols = ["test_name", "test_date", "test_status", "result_value", "result_unit"]
-                                        display_df = filtered_tests[display_cols].copy()
-                                        display_df.columns = ["Test Name", "Test Date", "Status", "Result", "Unit"]
+                                        display_df = filtered_tests[list(LAB_TEST_DISPLAY_COLUMNS)].rename(
+                                            columns=LAB_TEST_DISPLAY_COLUMNS, copy=False
+                                        )
                                         st.dataframe(display_df, use_container_width=True, height=300)
                                         
                                     except Exception as e:
@@ -1126,9 +1484,9 @@ Download the PDF below and send manually if needed.
                                         
                                         # Show data anyway
                                         st.info("Here's the test data:")
-                                        display_cols = ["test_name", "test_date", "test_status", "result_value", "result_unit"]
-                                        display_df = filtered_tests[display_cols].copy()
-                                        display_df.columns = ["Test Name", "Test Date", "Status", "Result", "Unit"]
+                                        display_df = filtered_tests[list(LAB_TEST_DISPLAY_COLUMNS)].rename(
+                                            columns=LAB_TEST_DISPLAY_COLUMNS, copy=False
+                                        )
                                         st.dataframe(display_df, use_container_width=True, height=300)
                     else:
                         st.error(f"❌ No patient found with ID: {patient_id}")
@@ -1142,48 +1500,42 @@ Download the PDF below and send manually if needed.
         uploaded = st.file_uploader("Upload CSV", type=["csv"])
         if uploaded:
             try:
-                csv_df = pd.read_csv(uploaded)
+                # Only the preview rows are parsed on reruns; the import streams the file
+                csv_df = pd.read_csv(uploaded, nrows=10, **IMPORT_READ_OPTIONS)
             except Exception as e:
                 st.error(f"Couldn't read CSV: {e}")
                 csv_df = None
 
             if csv_df is not None:
                 st.write("Preview (first 10 rows):")
-                st.dataframe(csv_df.head(10))
+                st.dataframe(csv_df)
                 if st.button("Import rows"):
                     required_cols = {"first_name", "last_name", "phone", "address"}
                     if not required_cols.issubset(set(csv_df.columns.str.lower())):
                         st.error(f"CSV missing required columns. Required: {required_cols}")
                     else:
-                        imported = 0
-                        errors = []
-                        for idx, row in csv_df.iterrows():
-                            # Normalize column names to lower for reading
-                            r = {k.lower(): (v if not pd.isna(v) else "") for k, v in row.items()}
-                            fn = r.get("first_name", "")
-                            ln = r.get("last_name", "")
-                            ph = r.get("phone", "")
-                            em = r.get("email", "")
-                            addr = r.get("address", "")
-                            ok_phone, phone_msg = validate_phone(str(ph))
-                            ok_email, email_msg = validate_email(str(em) if em is not None else "")
-                            if not fn or not ln or not addr or not ok_phone or not ok_email:
-                                errors.append(f"Row {idx+1}: validation failed.")
-                                continue
-                            insert_patient(conn, str(fn), str(ln), str(ph), str(em) if em else None, str(addr))
-                            imported += 1
-                        st.success(f"Imported {imported} rows. {len(errors)} rows skipped.")
-                        if errors:
-                            st.write("Sample errors:")
-                            st.write(errors[:10])
-                        df_all = fetch_all_patients(conn)
-                        df = df_all
+                        uploaded.seek(0)
+                        try:
+                            imported, rejected = import_patients_csv(conn, uploaded)
+                        except (pd.errors.ParserError, UnicodeDecodeError) as e:
+                            st.error(f"Couldn't read CSV: {e}")
+                        else:
+                            bump_patients_version()
+                            st.success(f"Imported {imported} rows. {len(rejected)} rows skipped.")
+                            if len(rejected):
+                                # Only the sample that is shown gets a message
+                                st.write("Sample errors:")
+                                st.write([f"Row {idx+1}: validation failed." for idx in rejected[:10]])
+                            df_all, patient_search = load_all_patients(conn)
+                            df = df_all
 
     # Footer: Show raw DB preview (collapsible)
     st.markdown("---")
     with st.expander("Raw database preview (for debugging)"):
-        st.write("Full table:")
-        st.dataframe(df_all)
+        # Expander bodies run even when collapsed, so only send rows on request
+        if st.checkbox("Load preview", key="raw_preview"):
+            st.write(f"First {min(len(df_all), RAW_PREVIEW_ROWS)} of {len(df_all)} rows:")
+            st.dataframe(df_all.head(RAW_PREVIEW_ROWS))
 
 if __name__ == "__main__":
     main()
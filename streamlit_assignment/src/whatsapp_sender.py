@@ -36,9 +36,16 @@ Usage:
         print(f"❌ {message}")
 """
 
+import hashlib
 import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
 from typing import Tuple, Optional
+from urllib3 import encode_multipart_formdata
 
 # Try to import streamlit for secrets support
 try:
@@ -75,14 +82,126 @@ def get_twilio_credentials():
     return account_sid, auth_token, whatsapp_from
 
 
-# Get credentials on module load
-TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_WHATSAPP_FROM = get_twilio_credentials()
+@lru_cache(maxsize=1)
+def _twilio_credentials() -> Tuple[str, str, str]:
+    """Load credentials on first use so importing this module has no side effects."""
+    return get_twilio_credentials()
+
+# Shared HTTP session so the upload fallbacks reuse pooled TLS connections;
+# failed connection attempts are retried briefly before a service is given up
+_UPLOAD_SESSION = requests.Session()
+_UPLOAD_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3))
+)
+
+# Per-service timeout in seconds, so a hung host falls through to the next one quickly
+UPLOAD_TIMEOUT = 10
+
+
+@lru_cache(maxsize=1)
+def _twilio_client():
+    """Build the Twilio client once; it keeps its own pooled HTTP session."""
+    from twilio.rest import Client
+    account_sid, auth_token, _ = _twilio_credentials()
+    return Client(account_sid, auth_token)
+
+
+def _upload_tmpfiles(body: bytes, content_type: str) -> Tuple[bool, str]:
+    """Upload to tmpfiles.org and return its direct download link."""
+    response = _UPLOAD_SESSION.post(
+        'https://tmpfiles.org/api/v1/upload',
+        data=body,
+        headers={'Content-Type': content_type},
+        timeout=UPLOAD_TIMEOUT
+    )
+    
+    if response.status_code == 200:
+        data = response.json()
+        if data.get('status') == 'success':
+            # tmpfiles returns URL in format: https://tmpfiles.org/12345
+            # But the actual download URL is: https://tmpfiles.org/dl/12345
+            raw_url = data.get('data', {}).get('url', '')
+            if raw_url:
+                # Convert to direct download link
+                return True, raw_url.replace('tmpfiles.org/', 'tmpfiles.org/dl/')
+    return False, str(response.status_code)
+
+
+def _upload_0x0(body: bytes, content_type: str) -> Tuple[bool, str]:
+    """Upload to 0x0.st, which answers with the file URL as plain text."""
+    response = _UPLOAD_SESSION.post(
+        'https://0x0.st',
+        data=body,
+        headers={'Content-Type': content_type},
+        timeout=UPLOAD_TIMEOUT
+    )
+    
+    if response.status_code == 200:
+        pdf_url = response.text.strip()
+        if pdf_url.startswith('https://'):
+            return True, pdf_url
+    return False, str(response.status_code)
+
+
+def _upload_fileio(body: bytes, content_type: str) -> Tuple[bool, str]:
+    """Upload to file.io (often rate-limited)."""
+    response = _UPLOAD_SESSION.post(
+        'https://file.io',
+        data=body,
+        headers={'Content-Type': content_type},
+        timeout=UPLOAD_TIMEOUT
+    )
+    
+    if response.status_code == 200:
+        data = response.json()
+        if data.get('success'):
+            pdf_url = data.get('link')
+            if pdf_url:
+                return True, pdf_url
+    return False, str(response.status_code)
+
+
+# (name, uploader, seconds a returned URL can be reused). tmpfiles.org keeps
+# files for an hour and 0x0.st for at least a day; file.io deletes a file
+# after its first download, so its links are never reused.
+UPLOAD_SERVICES = (
+    ("tmpfiles.org", _upload_tmpfiles, 50 * 60),
+    ("0x0.st", _upload_0x0, 24 * 60 * 60),
+    ("file.io", _upload_fileio, 0),
+)
+
+# (content digest, filename) -> (url, monotonic expiry) for resending a report
+_UPLOAD_URL_CACHE = {}
+_UPLOAD_URL_CACHE_LOCK = threading.Lock()
+
+
+def _cached_upload_url(key: Tuple[str, str]) -> Optional[str]:
+    """Return a still-valid URL for previously uploaded content, if any."""
+    with _UPLOAD_URL_CACHE_LOCK:
+        entry = _UPLOAD_URL_CACHE.get(key)
+    if entry and time.monotonic() < entry[1]:
+        return entry[0]
+    return None
+
+
+def _remember_upload_url(key: Tuple[str, str], url: str, ttl: int) -> None:
+    """Cache an upload URL for `ttl` seconds, dropping expired entries."""
+    now = time.monotonic()
+    with _UPLOAD_URL_CACHE_LOCK:
+        for stale in [k for k, (_, expires) in _UPLOAD_URL_CACHE.items() if expires <= now]:
+            del _UPLOAD_URL_CACHE[stale]
+        if ttl:
+            _UPLOAD_URL_CACHE[key] = (url, now + ttl)
 
 
 def upload_pdf_to_temporary_hosting(pdf_bytes: bytes, filename: str = "report.pdf") -> Tuple[bool, str]:
     """
     Upload PDF to a temporary hosting service with multiple fallback options.
-    Tries: tmpfiles.org -> 0x0.st -> file.io
+    Tries tmpfiles.org, 0x0.st and file.io one at a time and stops at the
+    first success, so a report is only ever stored on one host. Re-sending
+    identical bytes within the service's retention window reuses the earlier
+    URL instead of uploading again.
     
     Args:
         pdf_bytes: PDF file content as bytes
@@ -91,63 +210,27 @@ def upload_pdf_to_temporary_hosting(pdf_bytes: bytes, filename: str = "report.pd
     Returns:
         Tuple of (success: bool, url_or_error_message: str)
     """
-    errors = []
-    
-    # Option 1: Try tmpfiles.org (more reliable than file.io)
-    try:
-        response = requests.post(
-            'https://tmpfiles.org/api/v1/upload',
-            files={'file': (filename, pdf_bytes, 'application/pdf')},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                # tmpfiles returns URL in format: https://tmpfiles.org/12345
-                # But the actual download URL is: https://tmpfiles.org/dl/12345
-                raw_url = data.get('data', {}).get('url', '')
-                if raw_url:
-                    # Convert to direct download link
-                    pdf_url = raw_url.replace('tmpfiles.org/', 'tmpfiles.org/dl/')
-                    return True, pdf_url
-        errors.append(f"tmpfiles.org: {response.status_code}")
-    except Exception as e:
-        errors.append(f"tmpfiles.org: {str(e)}")
-    
-    # Option 2: Try 0x0.st (simple and reliable)
-    try:
-        response = requests.post(
-            'https://0x0.st',
-            files={'file': (filename, pdf_bytes, 'application/pdf')},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            pdf_url = response.text.strip()
-            if pdf_url.startswith('https://'):
-                return True, pdf_url
-        errors.append(f"0x0.st: {response.status_code}")
-    except Exception as e:
-        errors.append(f"0x0.st: {str(e)}")
+    key = (hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest(), filename)
+    cached_url = _cached_upload_url(key)
+    if cached_url:
+        return True, cached_url
+    
+    # Encode the multipart body once and share it between the uploads,
+    # rather than letting requests build a copy of the PDF per service
+    body, content_type = encode_multipart_formdata(
+        {'file': (filename, pdf_bytes, 'application/pdf')}
+    )
     
-    # Option 3: Try file.io (fallback, but often rate-limited)
-    try:
-        response = requests.post(
-            'https://file.io',
-            files={'file': (filename, pdf_bytes, 'application/pdf')},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                pdf_url = data.get('link')
-                if pdf_url:
-                    return True, pdf_url
-        errors.append(f"file.io: {response.status_code}")
-    except Exception as e:
-        errors.append(f"file.io: {str(e)}")
+    errors = []
+    for name, upload, ttl in UPLOAD_SERVICES:
+        try:
+            success, result = upload(body, content_type)
+        except Exception as e:
+            success, result = False, str(e)
+        if success:
+            _remember_upload_url(key, result, ttl)
+            return True, result
+        errors.append(f"{name}: {result}")
     
     # All services failed
     error_summary = "; ".join(errors)
@@ -171,9 +254,11 @@ def send_whatsapp_message_via_twilio(
         Tuple of (success: bool, message_or_error: str)
     """
     try:
-        from twilio.rest import Client
+        client = _twilio_client()
     except ImportError:
         return False, "Twilio library not installed. Run: pip install twilio"
+    except ValueError as e:
+        return False, str(e)
     
     try:
         # Ensure phone number has proper format
@@ -184,12 +269,9 @@ def send_whatsapp_message_via_twilio(
         # Format for Twilio WhatsApp
         whatsapp_to = f"whatsapp:{clean_phone}"
         
-        # Initialize Twilio client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        
         # Prepare message parameters
         message_params = {
-            'from_': TWILIO_WHATSAPP_FROM,
+            'from_': _twilio_credentials()[2],
             'to': whatsapp_to,
             'body': message_text
         }
@@ -217,7 +299,7 @@ def send_whatsapp_pdf(
     Complete workflow: Upload PDF and send via WhatsApp using Twilio.
     
     This is the main function you should use. It handles:
-    1. Uploading PDF to temporary hosting (file.io)
+    1. Uploading PDF to temporary hosting (first of tmpfiles.org, 0x0.st, file.io)
     2. Getting a public HTTPS URL
     3. Sending WhatsApp message with PDF via Twilio
     
@@ -281,17 +363,17 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Check if Twilio credentials are set
-    if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN:
+    try:
+        account_sid, _, whatsapp_from = _twilio_credentials()
+    except ValueError:
         print("❌ ERROR: Twilio credentials not set!")
         print("\nPlease set environment variables:")
         print("  export TWILIO_ACCOUNT_SID='your_account_sid'")
         print("  export TWILIO_AUTH_TOKEN='your_auth_token'")
         print("  export TWILIO_WHATSAPP_FROM='whatsapp:+14155238886'")
         sys.exit(1)
-    else:
-        print(f"✅ Using custom TWILIO_ACCOUNT_SID: {TWILIO_ACCOUNT_SID[:10]}...")
-    
-    print(f"📱 From: {TWILIO_WHATSAPP_FROM}")
+    print(f"✅ Using custom TWILIO_ACCOUNT_SID: {account_sid[:10]}...")
+    print(f"📱 From: {whatsapp_from}")
     
     # Test with a simple text message
     test_phone = os.getenv("TEST_PHONE", "+919711172197")
@@ -5,6 +5,7 @@ Test script to verify the authentication system
 import sqlite3
 import sys
 import os
+import uuid
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -24,12 +25,8 @@ def test_auth_system():
     """Test the authentication system"""
     print("🧪 Testing Authentication System\n")
     
-    # Use a test database
-    test_db = "test_auth.db"
-    
-    # Clean up if exists
-    if os.path.exists(test_db):
-        os.remove(test_db)
+    # Use a private in-memory test database; it is discarded when conn closes
+    test_db = f"file:test_auth_{uuid.uuid4().hex}?mode=memory&cache=shared"
     
     conn = get_connection(test_db)
     
@@ -111,9 +108,6 @@ def test_auth_system():
         return False
     finally:
         conn.close()
-        # Clean up test database
-        if os.path.exists(test_db):
-            os.remove(test_db)
     
     return True
 
@@ -16,7 +16,9 @@ import pytest
 import sqlite3
 import pandas as pd
 import tempfile
+import threading
 import os
+import uuid
 from io import StringIO
 import sys
 
@@ -27,23 +29,76 @@ from kavihealthcare import (
     get_connection,
     init_db,
     insert_patient,
+    insert_patients_bulk,
     update_patient,
     delete_patient,
     fetch_all_patients,
     fetch_patient_by_id,
     validate_phone,
     validate_email,
-    df_to_csv_bytes
+    df_to_csv_bytes,
+    iter_csv_chunks,
+    filter_lab_orders,
+    build_lab_order_search_index,
+    build_patient_search_index,
+    filter_patients,
+    lookup_patient,
+    import_patients_csv,
+    split_import_rows
 )
+from database import (
+    read_connection,
+    count_patients,
+    init_users_table,
+    authenticate_user,
+    create_user,
+    init_lab_tests_tables,
+    order_lab_tests_bulk,
+    update_lab_test_result,
+    fetch_patient_lab_tests,
+    fetch_pending_lab_tests
+)
+from database.connection import _is_open
 
 
 # ============================================
 # Fixtures
 # ============================================
 
+@pytest.fixture(scope="module")
+def shared_db():
+    """Create one private in-memory database for the whole module"""
+    uri = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    init_db(conn)
+    
+    yield conn, uri
+    
+    # The database is discarded with its last connection
+    conn.close()
+
+
+@pytest.fixture
+def temp_db(shared_db):
+    """Provide the shared test database, emptied again after each test"""
+    yield shared_db
+    
+    conn, _ = shared_db
+    conn.rollback()
+    tables = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    for (table,) in tables:
+        conn.execute(f"DELETE FROM {table}")
+    # Restart AUTOINCREMENT so every test sees the IDs of a fresh database
+    conn.execute("DELETE FROM sqlite_sequence")
+    conn.commit()
+
+
 @pytest.fixture
-def temp_db():
-    """Create a temporary database for testing"""
+def temp_db_file():
+    """Create a temporary on-disk database for tests of file-level behavior"""
     # Create temporary file
     fd, path = tempfile.mkstemp(suffix='.db')
     os.close(fd)
@@ -61,6 +116,19 @@ def temp_db():
         os.unlink(path)
 
 
+@pytest.fixture
+def add_patients(temp_db):
+    """Insert patient tuples in a single transaction and return their IDs in order"""
+    conn, _ = temp_db
+    
+    def add(rows):
+        count = insert_patients_bulk(conn, rows)
+        cursor = conn.execute("SELECT id FROM patients ORDER BY id DESC LIMIT ?", (count,))
+        return [row[0] for row in cursor][::-1]
+    
+    return add
+
+
 @pytest.fixture
 def sample_patient_data():
     """Provide sample patient data for testing"""
@@ -97,6 +165,75 @@ class TestDatabaseOperations:
         columns = {row[1] for row in cursor.fetchall()}
         expected_columns = {'id', 'first_name', 'last_name', 'phone', 'email', 'address', 'created_at'}
         assert expected_columns.issubset(columns)
+    
+    def test_newest_first_load_needs_no_sort(self, temp_db):
+        """Test that loading patients newest-first walks the table instead of sorting"""
+        conn, _ = temp_db
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM patients ORDER BY id DESC"
+        ).fetchall()
+        assert not any('TEMP B-TREE' in row[-1] for row in plan)
+    
+    def test_get_connection_enables_wal(self, temp_db_file):
+        """Test that get_connection applies WAL journaling"""
+        _, path = temp_db_file
+        conn = get_connection(path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == 'wal'
+        conn.close()
+    
+    def test_get_connection_cascades_lab_test_deletes(self, temp_db_file):
+        """Test that foreign keys are enforced so lab orders follow their patient"""
+        _, path = temp_db_file
+        conn = get_connection(path)
+        init_lab_tests_tables(conn)
+        patient_id = insert_patient(conn, 'Lab', 'Patient', '1234567890', None, 'Address')
+        order_lab_tests_bulk(conn, patient_id, ['CBC'], '2024-01-10', 'admin')
+        
+        delete_patient(conn, patient_id)
+        assert fetch_patient_lab_tests(conn, patient_id).empty
+        conn.close()
+    
+    def test_get_connection_reuses_and_replaces_closed(self, temp_db_file):
+        """Test that get_connection reuses the thread's connection until it is closed"""
+        _, path = temp_db_file
+        conn = get_connection(path)
+        assert get_connection(path) is conn
+        conn.close()
+        new_conn = get_connection(path)
+        assert new_conn is not conn
+        assert new_conn.execute("SELECT 1").fetchone()[0] == 1
+        new_conn.close()
+    
+    def test_get_connection_rolls_back_and_evicts(self, temp_db_file):
+        """Test that a checkout drops an abandoned transaction and closes dead threads' connections"""
+        _, path = temp_db_file
+        conn = get_connection(path)
+        conn.execute("INSERT INTO patients (first_name, last_name, phone, address) VALUES ('a', 'b', '1', 'c')")
+        assert conn.in_transaction
+        assert get_connection(path) is conn
+        assert not conn.in_transaction
+        assert count_patients(conn) == 0
+        
+        opened = []
+        worker = threading.Thread(target=lambda: opened.append(get_connection(path)))
+        worker.start()
+        worker.join()
+        get_connection(path)
+        assert not _is_open(opened[0])
+        conn.close()
+    
+    def test_read_connection_is_pooled_and_read_only(self, temp_db_file, sample_patient_data):
+        """Test that read_connection reuses a read-only connection that sees committed rows"""
+        conn, path = temp_db_file
+        insert_patient(conn, **sample_patient_data)
+        
+        with read_connection(path) as reader:
+            assert len(fetch_all_patients(reader)) == 1
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM patients")
+        with read_connection(path) as again:
+            assert again is reader
 
 
 # ============================================
@@ -155,6 +292,18 @@ class TestPatientCRUD:
         assert patient['email'] == 'john@example.com'
         assert patient['address'] == '123 Main St'
     
+    def test_insert_patients_bulk(self, temp_db):
+        """Test inserting several patients in one transaction"""
+        conn, _ = temp_db
+        count = insert_patients_bulk(conn, [
+            ('  Ann ', 'Lee', '1234567', '', '1 Road'),
+            ('Ben', 'Kim', '7654321', 'ben@example.com', '2 Road'),
+        ])
+        assert count == 2
+        df = fetch_all_patients(conn)
+        assert sorted(df['first_name']) == ['Ann', 'Ben']
+        assert df.loc[df['first_name'] == 'Ann', 'email'].isna().all()
+    
     def test_fetch_patient_by_id(self, temp_db, sample_patient_data):
         """Test fetching a patient by ID"""
         conn, _ = temp_db
@@ -172,28 +321,31 @@ class TestPatientCRUD:
         patient = fetch_patient_by_id(conn, 99999)
         assert patient is None
     
-    def test_fetch_all_patients(self, temp_db):
+    def test_fetch_all_patients(self, temp_db, add_patients):
         """Test fetching all patients"""
         conn, _ = temp_db
         
         # Insert multiple patients
-        insert_patient(conn, 'John', 'Doe', '1234567890', 'john@example.com', '123 Main St')
-        insert_patient(conn, 'Jane', 'Smith', '9876543210', 'jane@example.com', '456 Oak Ave')
-        insert_patient(conn, 'Bob', 'Johnson', '5555555555', None, '789 Pine Rd')
+        add_patients([
+            ('John', 'Doe', '1234567890', 'john@example.com', '123 Main St'),
+            ('Jane', 'Smith', '9876543210', 'jane@example.com', '456 Oak Ave'),
+            ('Bob', 'Johnson', '5555555555', None, '789 Pine Rd'),
+        ])
         
         df = fetch_all_patients(conn)
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 3
         assert 'id' in df.columns
         assert 'first_name' in df.columns
+        assert count_patients(conn) == 3
     
     def test_update_patient(self, temp_db, sample_patient_data):
         """Test updating patient information"""
         conn, _ = temp_db
         patient_id = insert_patient(conn, **sample_patient_data)
         
-        # Update patient
-        update_patient(
+        # Update patient; the stored row comes back from the UPDATE itself
+        patient = update_patient(
             conn,
             patient_id,
             'John',
@@ -203,7 +355,7 @@ class TestPatientCRUD:
             '999 New Address'  # Changed address
         )
         
-        patient = fetch_patient_by_id(conn, patient_id)
+        assert patient == dict(fetch_patient_by_id(conn, patient_id))
         assert patient['last_name'] == 'Smith'
         assert patient['phone'] == '5555555555'
         assert patient['email'] == 'john.smith@example.com'
@@ -215,7 +367,7 @@ class TestPatientCRUD:
         patient_id = insert_patient(conn, **sample_patient_data)
         
         # Update with None email
-        update_patient(
+        patient = update_patient(
             conn,
             patient_id,
             sample_patient_data['first_name'],
@@ -225,8 +377,8 @@ class TestPatientCRUD:
             sample_patient_data['address']
         )
         
-        patient = fetch_patient_by_id(conn, patient_id)
         assert patient['email'] is None
+        assert update_patient(conn, 99999, 'No', 'One', '1234567890', None, 'Nowhere') is None
     
     def test_delete_patient(self, temp_db, sample_patient_data):
         """Test deleting a patient"""
@@ -251,6 +403,50 @@ class TestPatientCRUD:
         delete_patient(conn, 99999)
 
 
+# ============================================
+# Authentication Tests
+# ============================================
+
+class TestAuthentication:
+    """Test password hashing and verification for user accounts"""
+    
+    def _stored_password(self, conn, username):
+        return conn.execute("SELECT password FROM users WHERE username = ?", (username,)).fetchone()[0]
+    
+    def test_passwords_are_stored_as_argon2_hashes(self, temp_db):
+        """Test that created users get an Argon2 hash that verifies the right password only"""
+        conn, _ = temp_db
+        init_users_table(conn)
+        create_user(conn, 'testuser', 'testpass', 'admin')
+        
+        stored = self._stored_password(conn, 'testuser')
+        assert stored != 'testpass'
+        assert stored.startswith('$argon2')
+        assert authenticate_user(conn, 'testuser', 'testpass')['username'] == 'testuser'
+        assert authenticate_user(conn, 'testuser', 'wrongpass') is None
+    
+    def test_default_admin_is_hashed(self, temp_db):
+        """Test that the seeded admin account is stored hashed and still logs in"""
+        conn, _ = temp_db
+        init_users_table(conn)
+        
+        assert self._stored_password(conn, 'admin').startswith('$argon2')
+        assert authenticate_user(conn, 'admin', 'admin')['role'] == 'admin'
+    
+    def test_legacy_plain_text_password_is_upgraded(self, temp_db):
+        """Test that a plain-text password still logs in once and is rehashed on login"""
+        conn, _ = temp_db
+        init_users_table(conn)
+        create_user(conn, 'legacy', 'secret', 'admin')
+        conn.execute("UPDATE users SET password = ? WHERE username = ?", ('secret', 'legacy'))
+        conn.commit()
+        
+        assert authenticate_user(conn, 'legacy', 'wrong') is None
+        assert self._stored_password(conn, 'legacy') == 'secret'
+        assert authenticate_user(conn, 'legacy', 'secret') is not None
+        assert self._stored_password(conn, 'legacy').startswith('$argon2')
+
+
 # ============================================
 # Validation Tests
 # ============================================
@@ -265,17 +461,16 @@ class TestValidation:
         assert is_valid is True
         assert msg == ''
     
-    def test_validate_phone_valid_with_formatting(self):
+    @pytest.mark.parametrize('phone', [
+        '+1-234-567-8900',
+        '+44 20 7946 0958',
+        '(123) 456-7890',
+        '123 456 7890',
+    ])
+    def test_validate_phone_valid_with_formatting(self, phone):
         """Test validation of phone numbers with formatting"""
-        test_cases = [
-            '+1-234-567-8900',
-            '+44 20 7946 0958',
-            '(123) 456-7890',
-            '123 456 7890',
-        ]
-        for phone in test_cases:
-            is_valid, msg = validate_phone(phone)
-            assert is_valid is True, f"Phone {phone} should be valid"
+        is_valid, msg = validate_phone(phone)
+        assert is_valid is True, f"Phone {phone} should be valid"
     
     def test_validate_phone_too_short(self):
         """Test validation rejects phone numbers with too few digits"""
@@ -300,18 +495,17 @@ class TestValidation:
         assert is_valid is False
     
     # Email validation tests
-    def test_validate_email_valid(self):
+    @pytest.mark.parametrize('email', [
+        'test@example.com',
+        'user.name@example.co.uk',
+        'user+tag@example.com',
+        'user_name123@example-domain.com'
+    ])
+    def test_validate_email_valid(self, email):
         """Test validation of valid email addresses"""
-        test_cases = [
-            'test@example.com',
-            'user.name@example.co.uk',
-            'user+tag@example.com',
-            'user_name123@example-domain.com'
-        ]
-        for email in test_cases:
-            is_valid, msg = validate_email(email)
-            assert is_valid is True, f"Email {email} should be valid"
-            assert msg == ''
+        is_valid, msg = validate_email(email)
+        assert is_valid is True, f"Email {email} should be valid"
+        assert msg == ''
     
     def test_validate_email_empty_is_valid(self):
         """Test that empty email is valid (optional field)"""
@@ -319,20 +513,19 @@ class TestValidation:
         assert is_valid is True
         assert msg == ''
     
-    def test_validate_email_invalid(self):
+    @pytest.mark.parametrize('email', [
+        'not-an-email',
+        'missing@domain',
+        '@example.com',
+        'user@',
+        'user @example.com',
+        'user@domain,com'
+    ])
+    def test_validate_email_invalid(self, email):
         """Test validation rejects invalid email addresses"""
-        test_cases = [
-            'not-an-email',
-            'missing@domain',
-            '@example.com',
-            'user@',
-            'user @example.com',
-            'user@domain,com'
-        ]
-        for email in test_cases:
-            is_valid, msg = validate_email(email)
-            assert is_valid is False, f"Email {email} should be invalid"
-            assert 'Invalid email' in msg
+        is_valid, msg = validate_email(email)
+        assert is_valid is False, f"Email {email} should be invalid"
+        assert 'Invalid email' in msg
 
 
 # ============================================
@@ -352,17 +545,131 @@ class TestUtilityFunctions:
         csv_bytes = df_to_csv_bytes(df)
         assert isinstance(csv_bytes, bytes)
         
-        # Decode and verify content
+        # Decode and verify content round-trips
         csv_str = csv_bytes.decode('utf-8')
-        assert 'name,age' in csv_str
-        assert 'John,30' in csv_str
-        assert 'Jane,25' in csv_str
+        parsed = pd.read_csv(StringIO(csv_str))
+        assert parsed.columns.tolist() == ['name', 'age']
+        assert parsed.values.tolist() == [['John', 30], ['Jane', 25]]
+    
+    def test_iter_csv_chunks_matches_single_write(self):
+        """Test that chunked CSV output has one header and every row"""
+        df = pd.DataFrame({'name': [f'n{i}' for i in range(5)], 'age': list(range(5))})
+        chunks = list(iter_csv_chunks(df, chunk_rows=2))
+        assert len(chunks) == 3
+        parsed = pd.read_csv(StringIO(b''.join(chunks).decode('utf-8')))
+        assert parsed.values.tolist() == df.values.tolist()
+    
+    def test_df_to_csv_bytes_mixed_type_column(self):
+        """Test that a mixed-type frame exports byte-for-byte like DataFrame.to_csv, across chunks"""
+        df = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5],
+            'score': [2.0, 1.5, None, 3.25, 0.1],
+            'name': ['Ann', 'Lee, Jr.', 'say "hi"', None, 'Émile'],
+            'flag': [True, False, True, False, True],
+            'value': [1, 'a', None, 2.5, 'b']
+        })
+        expected = df.to_csv(index=False).encode('utf-8')
+        assert df_to_csv_bytes(df) == expected
+        assert b''.join(iter_csv_chunks(df, chunk_rows=2)) == expected
     
     def test_df_to_csv_bytes_empty_dataframe(self):
         """Test converting empty DataFrame to CSV bytes"""
         df = pd.DataFrame()
         csv_bytes = df_to_csv_bytes(df)
         assert isinstance(csv_bytes, bytes)
+    
+    def test_filter_lab_orders(self):
+        """Test combined patient/test/status filtering of lab orders"""
+        orders = pd.DataFrame({
+            'patient_name': ['John Doe', 'Jane Smith', None],
+            'test_name': ['CRP Test', 'HbA1c Test', 'CRP Test'],
+            'test_status': ['Pending', 'Completed', 'Pending']
+        })
+        
+        index = build_lab_order_search_index(orders)
+        
+        assert len(filter_lab_orders(orders, index)) == 3
+        assert filter_lab_orders(orders, index, patient='JOHN')['patient_name'].tolist() == ['John Doe']
+        assert len(filter_lab_orders(orders, index, test='crp')) == 2
+        assert len(filter_lab_orders(orders, index, test='crp', status='Pending')) == 2
+        assert filter_lab_orders(orders, index, patient='smith', status='Pending').empty
+        # Filters are literal substrings, not regular expressions
+        assert filter_lab_orders(orders, index, test='(').empty
+
+
+    def test_filter_patients(self):
+        """Test sidebar patient filters as literal, case-insensitive substrings"""
+        patients = pd.DataFrame({
+            'first_name': ['John', 'Jane', 'Bob', 'ÉMILE'],
+            'last_name': ['Doe', 'Smith', 'Johnson', 'Zola'],
+            'phone': ['1234567890', '5551234567', '9998887777', '1112223333'],
+            'email': ['john@example.com', None, 'bob(at)example.com', None]
+        })
+        index = build_patient_search_index(patients)
+        assert filter_patients(patients, index) is patients
+        assert filter_patients(patients, index, name='JOHN')['first_name'].tolist() == ['John', 'Bob']
+        assert filter_patients(patients, index, name='john', phone='123')['first_name'].tolist() == ['John']
+        assert filter_patients(patients, index, email='(AT)')['first_name'].tolist() == ['Bob']
+        assert filter_patients(patients, index, name='é')['first_name'].tolist() == ['ÉMILE']
+    
+    def test_lookup_patient(self, temp_db):
+        """Test that patient lookups from the loaded frame match the database record"""
+        conn, _ = temp_db
+        pid = insert_patient(conn, 'Jane', 'Smith', '5551234567', None, '456 Oak Ave')
+        df_all = fetch_all_patients(conn)
+        
+        patient = lookup_patient(conn, df_all, pid)
+        assert patient == dict(fetch_patient_by_id(conn, pid))
+        assert type(patient['id']) is int and patient['email'] is None
+        
+        # IDs added after the frame was loaded come from the database
+        new_pid = insert_patient(conn, 'Bob', 'Lee', '5559876543', None, '1 Elm St')
+        assert lookup_patient(conn, df_all, new_pid)['first_name'] == 'Bob'
+        assert lookup_patient(conn, df_all, 999) is None
+    
+    def test_split_import_rows(self):
+        """Test vectorized validation of uploaded CSV rows"""
+        csv_df = pd.read_csv(StringIO(
+            "First_Name,Last_Name,Phone,Email,Address\n"
+            "John,Doe,1234567890,john@example.com,1 Main St\n"
+            "Jane,,1234567890,,2 Main St\n"
+            "Bob,Smith,123,,3 Main St\n"
+            "Amy,Lee,1234567890,not-an-email,4 Main St\n"
+            "Eve,Ray,+1 234 567 8900,,5 Main St\n"
+            "Tom,Hill,1234567890,,   \n"
+        ))
+        valid_rows, rejected = split_import_rows(csv_df)
+        assert valid_rows['first_name'].tolist() == ['John', 'Eve']
+        assert valid_rows.loc[4, 'email'] == ''
+        assert rejected.tolist() == [1, 2, 3, 5]
+    
+    def test_import_patients_csv(self, temp_db):
+        """Test that chunked CSV import inserts valid rows and reports rejected lines"""
+        conn, _ = temp_db
+        source = StringIO(
+            "first_name,last_name,phone,email,address\n"
+            "John,Doe,0123456789,,1 Main St\n"
+            "Jane,,1234567890,,2 Main St\n"
+            "Bob,Smith,1234567890,bob@example.com,3 Main St\n"
+            "Amy,Lee,123,,4 Main St\n"
+            "Eve,Ray,1234567890,,5 Main St\n"
+        )
+        imported, rejected = import_patients_csv(conn, source, chunk_rows=2)
+        assert imported == 3
+        assert list(rejected) == [1, 3]
+        df = fetch_all_patients(conn)
+        assert sorted(df['first_name']) == ['Bob', 'Eve', 'John']
+        assert df.loc[df['first_name'] == 'John', 'phone'].item() == '0123456789'
+    
+    def test_split_import_rows_without_email_column(self):
+        """Test that the optional email column may be missing"""
+        csv_df = pd.DataFrame({
+            'first_name': ['John'], 'last_name': ['Doe'],
+            'phone': [1234567890], 'address': ['1 Main St']
+        })
+        valid_rows, rejected = split_import_rows(csv_df)
+        assert valid_rows.values.tolist() == [['John', 'Doe', '1234567890', '', '1 Main St']]
+        assert rejected.empty
 
 
 # ============================================
@@ -397,48 +704,75 @@ class TestIntegration:
         patient = fetch_patient_by_id(conn, patient_id)
         assert patient is None
     
-    def test_multiple_patients_ordering(self, temp_db):
-        """Test that patients are ordered by created_at DESC"""
-        import time
+    def test_multiple_patients_ordering(self, temp_db, add_patients):
+        """Test that patients are ordered newest first"""
         conn, _ = temp_db
         
-        # Insert patients in sequence with small delays to ensure distinct timestamps
-        id1 = insert_patient(conn, 'First', 'Patient', '1111111111', None, 'Address 1')
-        time.sleep(0.01)
-        id2 = insert_patient(conn, 'Second', 'Patient', '2222222222', None, 'Address 2')
-        time.sleep(0.01)
-        id3 = insert_patient(conn, 'Third', 'Patient', '3333333333', None, 'Address 3')
+        id1, id2, id3 = add_patients([
+            ('First', 'Patient', '1111111111', None, 'Address 1'),
+            ('Second', 'Patient', '2222222222', None, 'Address 2'),
+            ('Third', 'Patient', '3333333333', None, 'Address 3'),
+        ])
         
         df = fetch_all_patients(conn)
         
-        # Most recent should be first (by created_at DESC)
-        # We verify the IDs are in the result but don't assume exact ordering
-        # since timestamp precision might vary
-        ids = df['id'].tolist()
-        assert id1 in ids
-        assert id2 in ids
-        assert id3 in ids
-        assert len(df) == 3
+        # Most recent should be first, even with identical created_at timestamps
+        assert df['id'].tolist() == [id3, id2, id1]
     
-    def test_search_filtering_scenario(self, temp_db):
+    def test_search_filtering_scenario(self, temp_db, add_patients):
         """Test realistic search/filter scenario"""
         conn, _ = temp_db
         
         # Create diverse patient set
-        insert_patient(conn, 'John', 'Doe', '1234567890', 'john@example.com', '123 Main St')
-        insert_patient(conn, 'Jane', 'Doe', '2345678901', 'jane@example.com', '456 Oak Ave')
-        insert_patient(conn, 'Bob', 'Smith', '3456789012', 'bob@test.com', '789 Pine Rd')
+        add_patients([
+            ('John', 'Doe', '1234567890', 'john@example.com', '123 Main St'),
+            ('Jane', 'Doe', '2345678901', 'jane@example.com', '456 Oak Ave'),
+            ('Bob', 'Smith', '3456789012', 'bob@test.com', '789 Pine Rd'),
+        ])
         
-        df = fetch_all_patients(conn)
+        # Same load and filter path as the View & manage tab
+        all_patients = fetch_all_patients(conn)
+        index = build_patient_search_index(all_patients)
         
-        # Test name filtering
-        doe_patients = df[df['last_name'] == 'Doe']
-        assert len(doe_patients) == 2
+        doe_patients = filter_patients(all_patients, index, name='doe')
+        assert sorted(doe_patients['first_name']) == ['Jane', 'John']
         
         # Test phone filtering
-        specific_phone = df[df['phone'].str.contains('1234')]
+        specific_phone = filter_patients(all_patients, index, phone='1234')
         assert len(specific_phone) == 1
         assert specific_phone.iloc[0]['first_name'] == 'John'
+        
+        # Filters combine
+        assert filter_patients(all_patients, index, name='doe', email='jane')['first_name'].tolist() == ['Jane']
+    
+    def test_patient_lab_tests_filters(self, temp_db):
+        """Test status and date filters on a patient's lab tests"""
+        conn, _ = temp_db
+        init_lab_tests_tables(conn)
+        patient_id = insert_patient(conn, 'Lab', 'Patient', '1234567890', None, 'Address')
+        order_lab_tests_bulk(conn, patient_id, ['CBC', 'Lipid Panel'], '2024-01-10', 'admin')
+        order_lab_tests_bulk(conn, patient_id, ['HbA1c'], '2024-02-01', 'admin')
+        
+        all_tests = fetch_patient_lab_tests(conn, patient_id)
+        assert len(all_tests) == 3
+        cbc_id = int(all_tests.loc[all_tests['test_name'] == 'CBC', 'id'].iloc[0])
+        update_lab_test_result(conn, cbc_id, 'Completed', '13.5', 'g/dL')
+        
+        completed = fetch_patient_lab_tests(conn, patient_id, status='Completed')
+        assert completed['test_name'].tolist() == ['CBC']
+        
+        on_date = fetch_patient_lab_tests(conn, patient_id, test_date='2024-01-10')
+        assert sorted(on_date['test_name']) == ['CBC', 'Lipid Panel']
+        
+        both = fetch_patient_lab_tests(conn, patient_id, status='Pending', test_date='2024-01-10')
+        assert both['test_name'].tolist() == ['Lipid Panel']
+        
+        pending = fetch_pending_lab_tests(conn)
+        assert sorted(pending['test_name']) == ['HbA1c', 'Lipid Panel']
+        assert (pending['patient_name'] == 'Lab Patient').all()
+        
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(patient_lab_tests)")}
+        assert {'ix_lab_status', 'ix_lab_patient_date'} <= indexes
 
 
 # ============================================
@@ -492,8 +826,9 @@ class TestEdgeCases:
     def test_empty_database_operations(self, temp_db):
         """Test operations on empty database"""
         conn, _ = temp_db
+        assert count_patients(conn) == 0
         df = fetch_all_patients(conn)
-        assert len(df) == 0
+        assert df.empty
         assert isinstance(df, pd.DataFrame)
 
 
@@ -8,10 +8,31 @@ Solution: Use a temporary file hosting service to upload the PDF.
 """
 
 import os
+import re
 import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
 from twilio.rest import Client
 
+# This example runs on its own (it doesn't import src/whatsapp_sender), so it
+# keeps its own session. Its uploads run one after another, so the default pool
+# sizes are enough. It retries 0x0.st one more time than the app does because
+# the next fallback here is file.io, whose links stop working after a single
+# download.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.3)))
+
+# Everything except digits and '+' is dropped from recipient numbers
+_PHONE_STRIP_RE = re.compile(r"[^\d+]")
+
+
+@lru_cache(maxsize=4)
+def get_client(account_sid, auth_token):
+    """Return one Twilio client per credential pair so its pooled TLS session is reused."""
+    return Client(account_sid, auth_token)
+
 def upload_pdf_to_temp_hosting(pdf_bytes, filename="report.pdf"):
     """
     Upload PDF to a temporary hosting service and get a public URL.
@@ -27,7 +48,7 @@ def upload_pdf_to_temp_hosting(pdf_bytes, filename="report.pdf"):
     try:
         # Option 1: 0x0.st (most reliable, expires in 30 days)
         print("  Trying 0x0.st...")
-        response = requests.post(
+        response = _SESSION.post(
             'https://0x0.st',
             files={'file': (filename, pdf_bytes, 'application/pdf')},
             data={'expires': 24},  # Expire in 24 hours
@@ -45,7 +66,7 @@ def upload_pdf_to_temp_hosting(pdf_bytes, filename="report.pdf"):
     try:
         # Option 2: file.io (expires after first download)
         print("  Trying file.io...")
-        response = requests.post(
+        response = _SESSION.post(
             'https://file.io',
             files={'file': (filename, pdf_bytes, 'application/pdf')},
             data={'expires': '1d'},
@@ -68,7 +89,7 @@ def upload_pdf_to_temp_hosting(pdf_bytes, filename="report.pdf"):
     try:
         # Option 3: litterbox (expires in 24 hours)
         print("  Trying litterbox...")
-        response = requests.post(
+        response = _SESSION.post(
             'https://litterbox.catbox.moe/resources/internals/api.php',
             files={'fileToUpload': (filename, pdf_bytes, 'application/pdf')},
             data={'time': '24h', 'reqtype': 'fileupload'},
@@ -114,7 +135,7 @@ def send_whatsapp_with_pdf(
         # Format phone number for WhatsApp
         if not phone_number.startswith('whatsapp:'):
             # Remove any spaces or special chars except +
-            clean_phone = ''.join(c for c in phone_number if c.isdigit() or c == '+')
+            clean_phone = _PHONE_STRIP_RE.sub('', phone_number)
             phone_number = f'whatsapp:{clean_phone}'
         
         # Step 1: Upload PDF to get public URL
@@ -132,7 +153,7 @@ def send_whatsapp_with_pdf(
         if not account_sid or not auth_token:
             raise Exception("Twilio credentials not provided")
         
-        client = Client(account_sid, auth_token)
+        client = get_client(account_sid, auth_token)
         
         message = client.messages.create(
             from_=from_number,
@@ -1,5 +1,15 @@
+import operator
+
 import streamlit as st
 
+# Operation name -> (function, symbol shown in the result)
+OPS = {
+    'Addition': (operator.add, '+'),
+    'Subtraction': (operator.sub, '-'),
+    'Multiplication': (operator.mul, '×'),
+    'Division': (operator.truediv, '÷'),
+}
+
 st.title('Simple Calculator')
 
 # Input fields for two numbers
@@ -9,26 +19,17 @@ num2 = st.number_input('Enter second number:', value=0.0, key="num2")
 # Operation selection
 operation = st.selectbox(
     'Select operation:',
-    ('Addition', 'Subtraction', 'Multiplication', 'Division'),
+    tuple(OPS),
     key="operation")
 
 # Calculate button
 if st.button('Calculate', key="calculate"):
-    if operation == 'Addition':
-        result = num1 + num2
-        st.success(f'{num1} + {num2} = {result}')
-    elif operation == 'Subtraction':
-        result = num1 - num2
-        st.success(f'{num1} - {num2} = {result}')
-    elif operation == 'Multiplication':
-        result = num1 * num2
-        st.success(f'{num1} × {num2} = {result}')
-    elif operation == 'Division':
-        if num2 != 0:
-            result = num1 / num2
-            st.success(f'{num1} ÷ {num2} = {result}')
-        else:
-            st.error('Error: Division by zero!')
+    fn, symbol = OPS[operation]
+    if fn is operator.truediv and num2 == 0:
+        st.error('Error: Division by zero!')
+    else:
+        result = fn(num1, num2)
+        st.success(f'{num1} {symbol} {num2} = {result}')
 
 # Add some usage instructions
 st.markdown('---')
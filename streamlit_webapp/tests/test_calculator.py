@@ -6,40 +6,38 @@ import os
 # Add the parent directory to the Python path so we can import the app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def test_calculator_addition():
-    """Test the calculator's addition functionality"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py"))
-    at.run()
-    
-    # Set input values using keys
-    at.number_input(key="num1").set_value(5.0)
-    at.number_input(key="num2").set_value(3.0)
-    at.selectbox(key="operation").set_value("Addition")
-    at.button(key="calculate").click()
-    at.run()
-    
-    # Check if result is displayed correctly
-    assert "5.0 + 3.0 = 8.0" in at.success[0].value
+CALC_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py")
 
-def test_calculator_division():
-    """Test the calculator's division functionality"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py"))
+@pytest.fixture(scope="module")
+def calc_app():
+    """Load and run the calculator script once for the whole module"""
+    at = AppTest.from_file(CALC_PATH)
     at.run()
+    yield at
+
+@pytest.mark.parametrize("a,b,op,sym,expected", [
+    (5.0, 3.0, "Addition", "+", 8.0),
+    (7.0, 3.0, "Subtraction", "-", 4.0),
+    (4.0, 3.0, "Multiplication", "×", 12.0),
+    (10.0, 2.0, "Division", "÷", 5.0),
+])
+def test_calculator_operations(calc_app, a, b, op, sym, expected):
+    """Test each arithmetic operation on the shared calculator app"""
+    at = calc_app
     
-    # Test normal division
-    at.number_input(key="num1").set_value(10.0)
-    at.number_input(key="num2").set_value(2.0)
-    at.selectbox(key="operation").set_value("Division")
+    # Set input values using keys
+    at.number_input(key="num1").set_value(a)
+    at.number_input(key="num2").set_value(b)
+    at.selectbox(key="operation").set_value(op)
     at.button(key="calculate").click()
     at.run()
     
     # Check if result is displayed correctly
-    assert "10.0 ÷ 2.0 = 5.0" in at.success[0].value
+    assert f"{a} {sym} {b} = {expected}" in at.success[0].value
 
-def test_calculator_division_by_zero():
+def test_calculator_division_by_zero(calc_app):
     """Test division by zero error handling"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py"))
-    at.run()
+    at = calc_app
     
     # Test division by zero
     at.number_input(key="num1").set_value(10.0)
@@ -49,30 +47,4 @@ def test_calculator_division_by_zero():
     at.run()
     
     # Check if error message is displayed
-    assert "Error: Division by zero!" in at.error[0].value
-
-def test_calculator_multiplication():
-    """Test the calculator's multiplication functionality"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py"))
-    at.run()
-    
-    at.number_input(key="num1").set_value(4.0)
-    at.number_input(key="num2").set_value(3.0)
-    at.selectbox(key="operation").set_value("Multiplication")
-    at.button(key="calculate").click()
-    at.run()
-    
-    assert "4.0 × 3.0 = 12.0" in at.success[0].value
-
-def test_calculator_subtraction():
-    """Test the calculator's subtraction functionality"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "calculator.py"))
-    at.run()
-    
-    at.number_input(key="num1").set_value(7.0)
-    at.number_input(key="num2").set_value(3.0)
-    at.selectbox(key="operation").set_value("Subtraction")
-    at.button(key="calculate").click()
-    at.run()
-    
-    assert "7.0 - 3.0 = 4.0" in at.success[0].value
\ No newline at end of file
+    assert "Error: Division by zero!" in at.error[0].value
\ No newline at end of file
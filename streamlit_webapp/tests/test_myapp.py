@@ -6,9 +6,11 @@ import os
 # Add the parent directory to the Python path so we can import the app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+MYAPP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "myapp.py")
+
 def test_myapp_initial_state():
     """Test the initial state of the app"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "myapp.py"))
+    at = AppTest.from_file(MYAPP_PATH)
     at.run()
     
     # Check title and welcome message
@@ -17,7 +19,7 @@ def test_myapp_initial_state():
 
 def test_myapp_empty_name_warning():
     """Test warning message when no name is entered"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "myapp.py"))
+    at = AppTest.from_file(MYAPP_PATH)
     at.run()
     
     # Find button widget by key and click it
@@ -29,7 +31,7 @@ def test_myapp_empty_name_warning():
 
 def test_myapp_greeting():
     """Test greeting message with name input"""
-    at = AppTest.from_file(os.path.join(os.path.dirname(os.path.dirname(__file__)), "src", "myapp.py"))
+    at = AppTest.from_file(MYAPP_PATH)
     at.run()
     
     # Set the name value and click the button